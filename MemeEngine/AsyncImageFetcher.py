@@ -0,0 +1,122 @@
+"""
+AsyncImageFetcher.py.
+
+This module defines the AsyncImageFetcher class, the asyncio counterpart of
+ImageFetcher used by the ASGI app. Downloads go through one httpx.AsyncClient
+with a bounded connection pool, so a process can wait on many slow uploads at
+once; the same header checks, size cap and signature sniffing apply.
+"""
+
+import asyncio
+
+import httpx
+
+from Metrics.Metrics import stage
+from .ImageFetcher import FetchError, check_headers, looks_like_image
+
+
+class FetchBusy(Exception):
+    """Raised when no pooled connection frees up in time to start a download."""
+
+
+class AsyncImageFetcher:
+    """Download images concurrently through a pooled async HTTP client."""
+
+    def __init__(self, connect_timeout: float = 3.05, read_timeout: float = 10,
+                 max_bytes: int = 10 * 1024 * 1024, max_connections: int = 100,
+                 chunk_size: int = 64 * 1024, client: httpx.AsyncClient = None,
+                 cache=None):
+        """
+        Initialize the fetcher and its pooled async client.
+
+        Args:
+            connect_timeout (float, optional): Seconds to wait for a connection.
+            read_timeout (float, optional): Seconds to wait between received bytes.
+            max_bytes (int, optional): Largest accepted image size. Default is 10MB.
+            max_connections (int, optional): Concurrent connections across all
+                hosts; further downloads wait for a free connection.
+            chunk_size (int, optional): Bytes read per streaming iteration.
+            client (httpx.AsyncClient, optional): Client to use instead of a new one.
+            cache (FetchCache, optional): Disk cache used to revalidate repeated URLs.
+        """
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                limits=httpx.Limits(max_connections=max_connections,
+                                    max_keepalive_connections=max_connections),
+            )
+        self.client = client
+        self.cache = cache
+
+    async def fetch_source(self, url: str):
+        """
+        Fetch the image at url, preferring the on-disk cache.
+
+        Behaves like ImageFetcher.fetch_source; cache reads and writes run in a
+        thread so the event loop is never blocked on disk.
+
+        Args:
+            url (str): An http(s) URL.
+
+        Returns:
+            str or bytes: Path to the cached image, or the image data.
+
+        Raises:
+            FetchError: If the request fails, times out, returns an unexpected
+                status, exceeds max_bytes or is not an image.
+            FetchBusy: If every pooled connection stayed busy; the server is
+                overloaded rather than the URL at fault.
+        """
+        with stage('fetch'):
+            if not url.lower().startswith(('http://', 'https://')):
+                raise FetchError(f"Unsupported URL scheme: {url}")
+
+            cached = await asyncio.to_thread(self.cache.lookup, url) if self.cache else None
+            headers = self.cache.validators(cached[1]) if cached else {}
+
+            try:
+                async with self.client.stream('GET', url, headers=headers,
+                                              follow_redirects=True) as response:
+                    if response.status_code == 304 and cached:
+                        await asyncio.to_thread(self.cache.touch, cached[0])
+                        return cached[0]
+                    if response.status_code != 200:
+                        raise FetchError(
+                            f"Unable to download image from URL (HTTP {response.status_code})"
+                        )
+                    check_headers(response.headers, self.max_bytes)
+                    data = await self._read_limited(response)
+                    response_headers = response.headers
+            except httpx.PoolTimeout as e:
+                raise FetchBusy(f"No connection available to download the image: {e}")
+            except httpx.HTTPError as e:
+                raise FetchError(f"Unable to download image from URL: {e}")
+
+            if not looks_like_image(data[:16]):
+                raise FetchError("Downloaded data is not a supported image")
+
+            if self.cache:
+                path = await asyncio.to_thread(self.cache.store, url, data, response_headers)
+                if path:
+                    return path
+            return data
+
+    async def _read_limited(self, response) -> bytes:
+        """Read the streamed body, aborting once it exceeds max_bytes."""
+        buffer = bytearray()
+        sniffed = False
+        async for chunk in response.aiter_bytes(chunk_size=self.chunk_size):
+            buffer.extend(chunk)
+            if len(buffer) > self.max_bytes:
+                raise FetchError(f"Image is too large (limit {self.max_bytes} bytes)")
+            if not sniffed and len(buffer) >= 16:
+                if not looks_like_image(bytes(buffer[:16])):
+                    raise FetchError("Downloaded data is not a supported image")
+                sniffed = True
+        return bytes(buffer)
+
+    async def aclose(self):
+        """Close the pooled connections."""
+        await self.client.aclose()
@@ -0,0 +1,175 @@
+"""
+FetchCache.py.
+
+This module defines the FetchCache class, a disk-backed cache of downloaded
+images keyed by normalized URL. Entries keep the ETag and Last-Modified
+validators so ImageFetcher can revalidate them with conditional requests.
+"""
+
+import hashlib
+import json
+import os
+import secrets
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Return a canonical form of url for use as a cache key.
+
+    The scheme and host are lower-cased, default ports and fragments are dropped
+    and query parameters are sorted.
+
+    Args:
+        url (str): An http(s) URL.
+
+    Returns:
+        str: The normalized URL.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{parts.port}'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or '/', query, ''))
+
+
+class FetchCache:
+    """A byte-bounded LRU cache of fetched images stored on disk."""
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the cache directory.
+
+        Args:
+            directory (str): Where cached images and their metadata are stored.
+            max_bytes (int, optional): Maximum total size of cached images.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url: str) -> tuple:
+        """Return the image and metadata paths for url."""
+        key = hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return f'{base}.img', f'{base}.json'
+
+    def lookup(self, url: str):
+        """
+        Return the cached entry for url, if any.
+
+        Args:
+            url (str): The image URL.
+
+        Returns:
+            tuple: (image path, metadata dict), or None when not cached.
+        """
+        img_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(img_path):
+            return None
+        return img_path, meta
+
+    @staticmethod
+    def validators(meta: dict) -> dict:
+        """
+        Build conditional request headers from an entry's metadata.
+
+        Args:
+            meta (dict): Metadata returned by lookup.
+
+        Returns:
+            dict: If-None-Match and/or If-Modified-Since headers.
+        """
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def touch(self, img_path: str):
+        """
+        Mark a cached image as recently used.
+
+        Only the access time is updated; the modification time is left alone so
+        MemeEngine's decoded-image cache, keyed by mtime, keeps hitting.
+
+        Args:
+            img_path (str): Path returned by lookup or store.
+        """
+        try:
+            os.utime(img_path, ns=(time.time_ns(), os.stat(img_path).st_mtime_ns))
+        except OSError:
+            pass
+
+    def store(self, url: str, data: bytes, headers) -> str:
+        """
+        Save a fetched image and its validators, then enforce the byte budget.
+
+        Responses without an ETag or Last-Modified header cannot be revalidated
+        and are not stored.
+
+        Args:
+            url (str): The image URL.
+            data (bytes): The image data.
+            headers (Mapping): The response headers.
+
+        Returns:
+            str: Path to the cached image, or None if it was not stored.
+        """
+        meta = {
+            'url': normalize_url(url),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'size': len(data),
+        }
+        if not (meta['etag'] or meta['last_modified']) or len(data) > self.max_bytes:
+            return None
+
+        img_path, meta_path = self._paths(url)
+        suffix = f'.{secrets.token_hex(4)}.part'
+        with open(img_path + suffix, 'wb') as f:
+            f.write(data)
+        os.replace(img_path + suffix, img_path)
+        with open(meta_path + suffix, 'w') as f:
+            json.dump(meta, f)
+        os.replace(meta_path + suffix, meta_path)
+
+        self.prune()
+        return img_path
+
+    def prune(self):
+        """Delete the least recently used entries until the byte budget holds."""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith('.img'):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_atime_ns, st.st_size, entry.path))
+                total += st.st_size
+
+        entries.sort()
+        for _, size, img_path in entries:
+            if total <= self.max_bytes:
+                break
+            for path in (img_path, img_path[:-len('.img')] + '.json'):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            total -= size
@@ -0,0 +1,235 @@
+"""
+ImageCatalog.py.
+
+This module defines the ImageCatalog class, a persistent index of the meme
+photos with each file's size, mtime, pixel dimensions and format. A rescan
+lists only directories whose mtime changed and probes only new or modified
+files, so a large library is not walked and decoded on every start. Files
+that cannot be decoded, or that exceed MemeEngine.max_pixels, are rejected
+when indexed instead of failing at render time.
+"""
+
+import json
+import logging
+import os
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION = 1
+
+
+class ImageCatalog:
+    """A persistent, incrementally updated index of image files."""
+
+    def __init__(self, path: str, roots: Iterable[str],
+                 extensions=('jpg', 'jpeg', 'png'), max_pixels: int = None):
+        """
+        Initialize the catalog stored at path; call scan() to update it.
+
+        Args:
+            path (str): Location of the index file; created on first save.
+            roots (Iterable[str]): Photo directories, indexed recursively.
+            extensions (tuple, optional): Image file extensions to index.
+            max_pixels (int, optional): Reject larger images. Defaults to
+                MemeEngine.max_pixels.
+        """
+        if max_pixels is None:
+            from .MemeEngine import MemeEngine
+            max_pixels = MemeEngine.max_pixels
+        self.path = path
+        self.roots = list(roots)
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.max_pixels = max_pixels
+        self.dirs, self.entries, self.rejected = self._read()
+
+    def _read(self) -> tuple:
+        """Load the index file, returning empty mappings if unusable."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}, {}, {}
+        if data.get('version') != CATALOG_VERSION:
+            return {}, {}, {}
+        return data.get('dirs', {}), data.get('images', {}), data.get('rejected', {})
+
+    def save(self):
+        """Write the index atomically, so concurrent readers never see a partial file."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{self.path}.{secrets.token_hex(4)}.part'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CATALOG_VERSION, 'dirs': self.dirs,
+                       'images': self.entries, 'rejected': self.rejected}, f,
+                      ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def probe(self, path: str) -> dict:
+        """
+        Read an image's metadata and check that it decodes.
+
+        JPEGs are decoded in draft mode at a reduced scale, which is enough to
+        detect truncated or corrupt data without paying for a full decode.
+
+        Args:
+            path (str): The image file.
+
+        Returns:
+            dict: width, height and format.
+
+        Raises:
+            ValueError: If the image cannot be decoded or exceeds max_pixels.
+        """
+        try:
+            with Image.open(path) as img:
+                width, height, fmt = img.width, img.height, img.format
+                if self.max_pixels and width * height > self.max_pixels:
+                    raise ValueError(
+                        f"too large ({width}x{height} pixels, limit {self.max_pixels})"
+                    )
+                img.draft('RGB', (max(1, width // 8), max(1, height // 8)))
+                img.load()
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(f"cannot decode: {e}")
+        return {'width': width, 'height': height, 'format': fmt}
+
+    def scan(self, full: bool = False, max_workers: int = None) -> bool:
+        """
+        Bring the index up to date and save it if anything changed.
+
+        Directories are listed again only if their mtime changed; files are
+        probed only if new or if their size or mtime changed. Files edited in
+        place inside an otherwise unchanged directory are only noticed by a
+        full scan.
+
+        Args:
+            full (bool, optional): List every directory and stat every file.
+            max_workers (int, optional): Threads used to probe new files.
+
+        Returns:
+            bool: True if the index changed.
+        """
+        changed = False
+        seen_dirs = set()
+        files = []
+        candidates = []
+        pending = list(reversed(self.roots))
+        while pending:
+            directory = pending.pop()
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            seen_dirs.add(directory)
+            listing = self.dirs.get(directory)
+            if full or listing is None or listing['mtime_ns'] != mtime:
+                fresh = self._list(directory, mtime)
+                changed = changed or fresh != listing
+                self.dirs[directory] = listing = fresh
+                candidates.extend(listing['files'])
+            files.extend(listing['files'])
+            pending.extend(reversed(listing['subdirs']))
+
+        for directory in list(self.dirs):
+            if directory not in seen_dirs:
+                del self.dirs[directory]
+                changed = True
+
+        to_probe = {}
+        for path in candidates:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            known = self.entries.get(path) or self.rejected.get(path)
+            if known is None or (known['size'], known['mtime_ns']) != \
+                    (st.st_size, st.st_mtime_ns):
+                to_probe[path] = st
+
+        if to_probe:
+            changed = True
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = executor.map(self._try_probe, to_probe)
+                for (path, st), (meta, error) in zip(to_probe.items(), results):
+                    stat = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+                    if error is None:
+                        self.entries[path] = {**stat, **meta}
+                        self.rejected.pop(path, None)
+                    else:
+                        logger.warning("Skipping image %s: %s", path, error)
+                        self.rejected[path] = {**stat, 'error': error}
+                        self.entries.pop(path, None)
+
+        present = set(files)
+        for index in (self.entries, self.rejected):
+            for path in [path for path in index if path not in present]:
+                del index[path]
+                changed = True
+
+        if changed:
+            self.save()
+        return changed
+
+    def _list(self, directory: str, mtime: int) -> dict:
+        """List the image files and subdirectories of directory, sorted by name."""
+        files, subdirs = [], []
+        with os.scandir(directory) as it:
+            for entry in sorted(it, key=lambda e: e.name):
+                if entry.is_dir():
+                    subdirs.append(entry.path)
+                elif entry.name.lower().endswith(self.extensions):
+                    files.append(entry.path)
+        return {'mtime_ns': mtime, 'files': files, 'subdirs': subdirs}
+
+    def _try_probe(self, path: str) -> tuple:
+        """Return (metadata, None) for a valid image or (None, error message)."""
+        try:
+            return self.probe(path), None
+        except ValueError as e:
+            return None, str(e)
+
+    def images(self) -> List[str]:
+        """
+        Return every valid image path in directory order.
+
+        Returns:
+            List[str]: Indexed images below the roots, excluding rejected files.
+        """
+        images = []
+        pending = list(reversed(self.roots))
+        while pending:
+            listing = self.dirs.get(pending.pop())
+            if listing is None:
+                continue
+            images.extend(path for path in listing['files'] if path in self.entries)
+            pending.extend(reversed(listing['subdirs']))
+        return images
+
+    def directories(self) -> dict:
+        """
+        Return the indexed directories and their mtimes.
+
+        Returns:
+            dict: Directory path to st_mtime_ns as of the last scan.
+        """
+        return {directory: listing['mtime_ns'] for directory, listing in self.dirs.items()}
+
+    def get(self, path: str) -> dict:
+        """
+        Return the indexed metadata of an image.
+
+        Args:
+            path (str): An image path as returned by images().
+
+        Returns:
+            dict: size, mtime_ns, width, height and format, or None if the
+            image is not indexed or was rejected.
+        """
+        return self.entries.get(path)
@@ -0,0 +1,188 @@
+"""
+ImageFetcher.py.
+
+This module defines the ImageFetcher class, which downloads remote images over a
+pooled HTTP session with timeouts and a size cap enforced while streaming, and
+validates that the payload really is an image before it reaches MemeEngine.
+An optional FetchCache lets repeated URLs be revalidated instead of downloaded.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from Metrics.Metrics import stage
+
+# Leading bytes of the image formats MemeEngine can decode.
+IMAGE_SIGNATURES = (
+    b'\xff\xd8\xff',            # JPEG
+    b'\x89PNG\r\n\x1a\n',       # PNG
+    b'GIF87a',
+    b'GIF89a',
+    b'BM',                      # BMP
+    b'II*\x00',                 # TIFF, little endian
+    b'MM\x00*',                 # TIFF, big endian
+)
+
+
+class FetchError(ValueError):
+    """Raised when a remote image cannot be fetched or is not an acceptable image."""
+
+
+def looks_like_image(data: bytes) -> bool:
+    """
+    Check the leading bytes of data against known image signatures.
+
+    Args:
+        data (bytes): The start of the payload (at least 12 bytes when available).
+
+    Returns:
+        bool: True if data starts like a supported image format.
+    """
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return True
+    return data.startswith(IMAGE_SIGNATURES)
+
+
+def check_headers(headers, max_bytes: int):
+    """
+    Reject a response whose headers announce a non-image or oversized body.
+
+    Args:
+        headers (Mapping): The response headers.
+        max_bytes (int): The largest accepted body size.
+
+    Raises:
+        FetchError: If Content-Type is not image/* or Content-Length is too large.
+    """
+    content_type = headers.get('Content-Type', '').split(';')[0].strip().lower()
+    if content_type and not content_type.startswith('image/'):
+        raise FetchError(f"URL does not point to an image (Content-Type: {content_type})")
+
+    length = headers.get('Content-Length')
+    if length is not None:
+        try:
+            length = int(length)
+        except ValueError:
+            raise FetchError(f"Invalid Content-Length: {length}")
+        if length > max_bytes:
+            raise FetchError(f"Image is too large ({length} bytes, limit {max_bytes})")
+
+
+class ImageFetcher:
+    """Download images through a shared connection pool with strict limits."""
+
+    def __init__(self, connect_timeout: float = 3.05, read_timeout: float = 10,
+                 max_bytes: int = 10 * 1024 * 1024, pool_size: int = 10,
+                 chunk_size: int = 64 * 1024, session: requests.Session = None,
+                 cache=None):
+        """
+        Initialize the fetcher and its pooled HTTP session.
+
+        Args:
+            connect_timeout (float, optional): Seconds to wait for a connection.
+            read_timeout (float, optional): Seconds to wait between received bytes.
+            max_bytes (int, optional): Largest accepted image size. Default is 10MB.
+            pool_size (int, optional): Connections kept alive per host.
+            chunk_size (int, optional): Bytes read per streaming iteration.
+            session (requests.Session, optional): Session to use instead of a new one.
+            cache (FetchCache, optional): Disk cache used to revalidate repeated URLs.
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+        self.cache = cache
+
+    def fetch(self, url: str) -> bytes:
+        """
+        Download the image at url.
+
+        Args:
+            url (str): An http(s) URL.
+
+        Returns:
+            bytes: The image data.
+
+        Raises:
+            FetchError: If the request fails, times out, returns a non-200
+                status, exceeds max_bytes or is not an image.
+        """
+        source = self.fetch_source(url)
+        if isinstance(source, bytes):
+            return source
+        with open(source, 'rb') as f:
+            return f.read()
+
+    def fetch_source(self, url: str):
+        """
+        Fetch the image at url, preferring the on-disk cache.
+
+        Cached entries are revalidated with If-None-Match/If-Modified-Since and
+        returned as a file path, which also lets MemeEngine reuse its decoded
+        copy of hot images. Uncacheable responses are returned as bytes.
+
+        Args:
+            url (str): An http(s) URL.
+
+        Returns:
+            str or bytes: Path to the cached image, or the image data.
+
+        Raises:
+            FetchError: If the request fails, times out, returns an unexpected
+                status, exceeds max_bytes or is not an image.
+        """
+        with stage('fetch'):
+            if not url.lower().startswith(('http://', 'https://')):
+                raise FetchError(f"Unsupported URL scheme: {url}")
+
+            cached = self.cache.lookup(url) if self.cache else None
+            headers = self.cache.validators(cached[1]) if cached else {}
+
+            try:
+                with self.session.get(url, stream=True, timeout=self.timeout,
+                                      headers=headers) as response:
+                    if response.status_code == 304 and cached:
+                        self.cache.touch(cached[0])
+                        return cached[0]
+                    if response.status_code != 200:
+                        raise FetchError(
+                            f"Unable to download image from URL (HTTP {response.status_code})"
+                        )
+                    check_headers(response.headers, self.max_bytes)
+                    data = self._read_limited(response)
+                    response_headers = response.headers
+            except requests.RequestException as e:
+                raise FetchError(f"Unable to download image from URL: {e}")
+
+            if not looks_like_image(data[:16]):
+                raise FetchError("Downloaded data is not a supported image")
+
+            if self.cache:
+                path = self.cache.store(url, data, response_headers)
+                if path:
+                    return path
+            return data
+
+    def _read_limited(self, response) -> bytes:
+        """Read the streamed body, aborting once it exceeds max_bytes."""
+        buffer = bytearray()
+        sniffed = False
+        for chunk in response.iter_content(chunk_size=self.chunk_size):
+            buffer.extend(chunk)
+            if len(buffer) > self.max_bytes:
+                raise FetchError(f"Image is too large (limit {self.max_bytes} bytes)")
+            # Stop early on non-image payloads rather than downloading them.
+            if not sniffed and len(buffer) >= 16:
+                if not looks_like_image(bytes(buffer[:16])):
+                    raise FetchError("Downloaded data is not a supported image")
+                sniffed = True
+        return bytes(buffer)
+
+    def close(self):
+        """Close the pooled connections."""
+        self.session.close()
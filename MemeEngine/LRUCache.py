@@ -0,0 +1,175 @@
+"""
+LRUCache.py.
+
+This module defines the LRUCache class, a small thread-safe least-recently-used
+cache with hit/miss counters and an optional byte budget, shared by the
+MemeEngine caches. Named caches also count hits, misses and evictions in the
+metrics registry, so render workers report them back with their other metrics.
+"""
+
+import threading
+from collections import OrderedDict
+
+from Metrics.Metrics import registry
+
+CACHE_HITS = registry.counter('meme_cache_hits_total', 'Cache hits, by cache.', ('cache',))
+CACHE_MISSES = registry.counter('meme_cache_misses_total', 'Cache misses, by cache.',
+                                ('cache',))
+CACHE_EVICTIONS = registry.counter(
+    'meme_cache_evictions_total', 'Entries evicted to stay within bounds, by cache.',
+    ('cache',)
+)
+
+
+class LRUCache:
+    """A thread-safe LRU mapping bounded by entry count and, optionally, bytes."""
+
+    def __init__(self, maxsize: int = 128, max_bytes: int = None, sizeof=None,
+                 name: str = None):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize (int, optional): Maximum number of entries kept. Default is 128.
+            max_bytes (int, optional): Maximum total size of the cached values.
+            sizeof (callable, optional): Returns the size in bytes of a value.
+                Required when max_bytes is set.
+            name (str, optional): Label for the registry counters; unnamed
+                caches keep only their own counters.
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.current_bytes = 0
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Return the cached value for key and mark it as recently used.
+
+        Args:
+            key: The cache key.
+            default: Value returned when the key is missing.
+
+        Returns:
+            The cached value, or default on a miss.
+        """
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                self.misses += 1
+                if self.name:
+                    CACHE_MISSES.inc(1, self.name)
+                return default
+            self.hits += 1
+            if self.name:
+                CACHE_HITS.inc(1, self.name)
+            return self._data[key]
+
+    def put(self, key, value):
+        """
+        Store value under key, evicting the least recently used entries.
+
+        Args:
+            key: The cache key.
+            value: The value to cache.
+        """
+        size = self.sizeof(value) if self.sizeof else 0
+        with self._lock:
+            if key in self._data:
+                self._discard(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = value
+            self._sizes[key] = size
+            self.current_bytes += size
+            self._evict()
+
+    def resize(self, maxsize: int = None, max_bytes: int = None):
+        """
+        Change the cache bounds, evicting entries that no longer fit.
+
+        Args:
+            maxsize (int, optional): New maximum number of entries.
+            max_bytes (int, optional): New maximum total size in bytes.
+        """
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until the bounds hold."""
+        while self._data and (
+            len(self._data) > self.maxsize
+            or (self.max_bytes is not None and self.current_bytes > self.max_bytes)
+        ):
+            key = next(iter(self._data))
+            self._discard(key)
+            self.evictions += 1
+            if self.name:
+                CACHE_EVICTIONS.inc(1, self.name)
+
+    def _discard(self, key):
+        """Remove key and release its accounted size."""
+        del self._data[key]
+        self.current_bytes -= self._sizes.pop(key)
+
+    def get_or_create(self, key, factory):
+        """
+        Return the cached value for key, building it with factory on a miss.
+
+        Args:
+            key: The cache key.
+            factory (callable): Zero-argument callable producing the value.
+
+        Returns:
+            The cached or newly created value.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict:
+        """
+        Return a snapshot of the cache counters.
+
+        Returns:
+            dict: Entry count, capacity, bytes held, hits, misses and evictions.
+        """
+        with self._lock:
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._data)
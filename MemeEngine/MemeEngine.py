@@ -2,34 +2,419 @@
 MemeEngine.py.
 
 This module defines the MemeEngine class, which generates image memes by adding
-text (a quote and author) to a provided image and saving it to a specified output directory.
+text (a quote and author) to a provided image and saving it to a specified output
+directory, or returning the encoded image in memory.
+
+Image sources may be given as a file path, raw bytes or a binary file-like object.
+Each rendering stage (decode, resize, layout, draw, encode, write) is timed
+into the meme_stage_seconds histogram.
 """
 
+import hashlib
+import io
 import os
 import random
+import secrets
 import textwrap
-from PIL import Image, ImageDraw, ImageFont
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator
+from PIL import ExifTags, Image, ImageDraw, ImageFont, ImageOps
+
+from Metrics.Metrics import stage
+from .LRUCache import LRUCache
+from .Pruner import prune_directory, prune_every
+from .TextTile import TextTile
+
+
+def _image_nbytes(img) -> int:
+    """Return the approximate decoded size of a Pillow image in bytes."""
+    return img.width * img.height * len(img.getbands())
+
+
+def _read_source(source):
+    """Return source unchanged if it is a path or bytes, else read the stream."""
+    if hasattr(source, 'read'):
+        return source.read()
+    return source
+
+
+def _is_bytes(source) -> bool:
+    """Return True if source holds image data rather than a path."""
+    return isinstance(source, (bytes, bytearray, memoryview))
+
+
+def _render_group(engine, source, items: list, width: int) -> list:
+    """Render a group of jobs in a worker process; see MemeEngine.make_memes."""
+    return engine._render_group(source, items, width)
 
 
 class MemeEngine:
     """A class to generate memes by adding quotes to images."""
 
-    def __init__(self, output_dir: str):
+    font_path = "./fonts/LilitaOne-Regular.ttf"
+    font_size = 20
+    wrap_width = 40
+    stroke_width = 1
+    # Drop shadow under the quote; an offset of 0 disables it.
+    shadow_offset = 0
+    shadow_blur = 2
+    shadow_opacity = 0.6
+
+    # Process-wide caches shared by every MemeEngine instance.
+    font_cache = LRUCache(maxsize=16, name='font')
+    layout_cache = LRUCache(maxsize=4096, name='layout')
+    base_image_cache = LRUCache(
+        maxsize=1024,
+        max_bytes=int(os.environ.get('MEME_BASE_CACHE_BYTES', 64 * 1024 * 1024)),
+        sizeof=_image_nbytes,
+        name='base_image'
+    )
+    text_tile_cache = LRUCache(
+        maxsize=4096,
+        max_bytes=int(os.environ.get('MEME_TEXT_TILE_CACHE_BYTES', 16 * 1024 * 1024)),
+        sizeof=lambda tile: tile.nbytes,
+        name='text_tile'
+    )
+
+    # Output encodings: preset name -> (Pillow format, file extension, save options).
+    # 'jpeg' keeps Pillow's defaults; the others trade encode time for fewer bytes.
+    PRESETS = {
+        'jpeg': ('JPEG', 'jpg', {}),
+        'jpeg-progressive': ('JPEG', 'jpg', {'quality': 75, 'optimize': True,
+                                             'progressive': True}),
+        'webp': ('WEBP', 'webp', {'quality': 75, 'method': 4}),
+        'avif': ('AVIF', 'avif', {'quality': 60, 'speed': 8}),
+    }
+
+    # make_meme prunes the output directory on every Nth write only.
+    prune_interval = int(os.environ.get('MEME_PRUNE_INTERVAL', 32))
+
+    # Decompression-bomb guard: larger sources are rejected before decoding.
+    max_pixels = int(os.environ.get('MEME_MAX_PIXELS', 50_000_000))
+
+    def __init__(self, output_dir: str, deterministic: bool = False,
+                 max_files: int = None, max_bytes: int = None, preset: str = 'jpeg',
+                 **save_options):
         """
         Initialize MemeEngine with the output directory.
 
         Args:
             output_dir (str): The directory where memes will be saved.
+            deterministic (bool, optional): Derive text placement and file name
+                from the inputs, so identical requests reuse one output file.
+            max_files (int, optional): Maximum number of memes kept in output_dir;
+                make_meme checks it every prune_interval writes.
+            max_bytes (int, optional): Maximum total size of output_dir in bytes.
+            preset (str, optional): Output encoding, a key of PRESETS.
+            **save_options: Pillow save options overriding the preset's, e.g.
+                quality=70 or subsampling='4:4:4'.
+
+        Raises:
+            ValueError: If preset is unknown.
         """
+        if preset not in self.PRESETS:
+            raise ValueError(f"Unknown output preset: {preset}")
         self.output_dir = output_dir
+        self.deterministic = deterministic
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.preset = preset
+        self.output_format, self.output_extension, options = self.PRESETS[preset]
+        self.save_options = {**options, **save_options}
         os.makedirs(output_dir, exist_ok=True)
 
-    def make_meme(self, img_path: str, text: str, author: str, width: int = 500) -> str:
+    def with_preset(self, preset: str, **save_options) -> 'MemeEngine':
+        """
+        Return an engine writing to the same directory with another encoding.
+
+        Args:
+            preset (str): Output encoding, a key of PRESETS.
+            **save_options: Pillow save options overriding the preset's.
+
+        Returns:
+            MemeEngine: The new engine.
+        """
+        return type(self)(self.output_dir, self.deterministic, self.max_files,
+                          self.max_bytes, preset, **save_options)
+
+    @classmethod
+    def supported_presets(cls) -> list:
+        """
+        Return the presets this Pillow build can encode.
+
+        Returns:
+            list: Preset names, in PRESETS order.
+        """
+        Image.init()
+        return [name for name, (fmt, _, _) in cls.PRESETS.items() if fmt in Image.SAVE]
+
+    @classmethod
+    def load_font(cls, font_path: str, size: int):
+        """
+        Return the font for (font_path, size), loading it only once per process.
+
+        Args:
+            font_path (str): Path to a TrueType font file.
+            size (int): Font size in points.
+
+        Returns:
+            ImageFont: The loaded font, or Pillow's default font if unavailable.
+        """
+        def load():
+            try:
+                return ImageFont.truetype(font_path, size=size)
+            except IOError:
+                return ImageFont.load_default()
+
+        return cls.font_cache.get_or_create((font_path, size), load)
+
+    @classmethod
+    def negotiate_preset(cls, accepted, presets: list) -> str:
+        """
+        Pick the first preset whose MIME type a client explicitly accepts.
+
+        Wildcards such as */* do not count, since clients sending only those
+        may not decode newer formats; the last preset is the fallback.
+
+        Args:
+            accepted (Iterable[str]): MIME types from the Accept header with q > 0.
+            presets (list): Candidate presets, most preferred first.
+
+        Returns:
+            str: The chosen preset.
+        """
+        Image.init()
+        accepted = set(accepted)
+        for preset in presets[:-1]:
+            if Image.MIME.get(cls.PRESETS[preset][0]) in accepted:
+                return preset
+        return presets[-1]
+
+    @classmethod
+    def layout_text(cls, text: str, author: str, font_path: str, font_size: int,
+                    wrap_width: int, stroke_width: int) -> tuple:
+        """
+        Wrap a quote and measure it, reusing earlier results for the same inputs.
+
+        Args:
+            text (str): Quote body text.
+            author (str): Quote author.
+            font_path (str): Path to the font used for measuring.
+            font_size (int): Font size in points.
+            wrap_width (int): Maximum characters per line.
+            stroke_width (int): Outline width in pixels.
+
+        Returns:
+            tuple: The wrapped text, its width and its height in pixels.
+        """
+        key = (text, author, font_path, font_size, wrap_width, stroke_width)
+
+        def measure():
+            font = cls.load_font(font_path, font_size)
+            quote = f'"{text}"\n- {author}'
+            wrapped = textwrap.fill(quote, width=wrap_width)
+            draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+            try:
+                bbox = draw.multiline_textbbox((0, 0), wrapped, font=font,
+                                               stroke_width=stroke_width)
+                return wrapped, bbox[2] - bbox[0], bbox[3] - bbox[1]
+            except AttributeError:
+                text_width, text_height = draw.multiline_textsize(wrapped, font=font)
+                return wrapped, text_width, text_height
+
+        return cls.layout_cache.get_or_create(key, measure)
+
+    @classmethod
+    def text_tile(cls, text: str, author: str, font_path: str, font_size: int,
+                  wrap_width: int, stroke_width: int, shadow: tuple = None) -> TextTile:
+        """
+        Return the quote rasterized into a tile, reusing earlier tiles for the same inputs.
+
+        The tile is independent of the photo and of the text position, so one
+        rasterization serves every meme showing the same quote.
+
+        Args:
+            text (str): Quote body text.
+            author (str): Quote author.
+            font_path (str): Path to the font used for rendering.
+            font_size (int): Font size in points.
+            wrap_width (int): Maximum characters per line.
+            stroke_width (int): Outline width in pixels.
+            shadow (tuple, optional): (offset, blur, opacity) of a drop shadow.
+
+        Returns:
+            TextTile: White text with a black outline.
+        """
+        key = (text, author, font_path, font_size, wrap_width, stroke_width, shadow)
+
+        def rasterize():
+            wrapped, _, _ = cls.layout_text(text, author, font_path, font_size,
+                                            wrap_width, stroke_width)
+            offset, blur, opacity = shadow or (0, 0, 0)
+            return TextTile.rasterize(
+                wrapped, cls.load_font(font_path, font_size), fill='white',
+                stroke_fill='black', stroke_width=stroke_width, spacing=4,
+                shadow_offset=offset, shadow_blur=blur, shadow_opacity=opacity
+            )
+
+        return cls.text_tile_cache.get_or_create(key, rasterize)
+
+    @classmethod
+    def configure_base_cache(cls, max_bytes: int):
+        """
+        Set the byte budget of the decoded base-image cache.
+
+        Args:
+            max_bytes (int): Maximum total size of cached images; 0 disables it.
+        """
+        cls.base_image_cache.resize(max_bytes=max_bytes)
+
+    @classmethod
+    def _decode_resized(cls, fp, width: int, name: str):
+        """
+        Decode an image to RGB and resize it to width, keeping aspect ratio.
+
+        The EXIF orientation is applied, and JPEGs are decoded in draft mode at
+        the smallest DCT scale still at least as large as the target, so a
+        large photo never exists in memory at full resolution.
+
+        Args:
+            fp: A path or binary file-like object.
+            width (int): Desired image width.
+            name (str): Label used in error messages.
+
+        Returns:
+            Image: The resized RGB image.
+
+        Raises:
+            ValueError: If the image cannot be decoded or exceeds max_pixels.
+        """
+        with stage('decode'):
+            try:
+                img = Image.open(fp)
+            except Exception as e:
+                raise ValueError(f"Cannot open image {name}: {e}")
+
+            with img:
+                if cls.max_pixels and img.width * img.height > cls.max_pixels:
+                    raise ValueError(
+                        f"Image {name} is too large ({img.width}x{img.height} pixels, "
+                        f"limit {cls.max_pixels})"
+                    )
+                try:
+                    orientation = img.getexif().get(ExifTags.Base.Orientation, 1)
+                    # Orientations 5-8 swap width and height when displayed.
+                    rotated = orientation in (5, 6, 7, 8)
+                    original_width, original_height = \
+                        (img.height, img.width) if rotated else img.size
+
+                    # Resize image keeping aspect ratio
+                    ratio = width / float(original_width)
+                    height = int(ratio * original_height)
+
+                    img.draft('RGB', (height, width) if rotated else (width, height))
+                    if orientation != 1:
+                        img = ImageOps.exif_transpose(img)
+                    img = img.convert('RGB')
+                except Exception as e:
+                    raise ValueError(f"Cannot open image {name}: {e}")
+
+        with stage('resize'):
+            return img.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+    @classmethod
+    def load_base_image(cls, source, width: int):
+        """
+        Return source decoded to RGB and resized to width, keeping aspect ratio.
+
+        Images loaded from a path are cached by (path, mtime, width) and shared;
+        callers must copy the returned image before drawing on it.
+
+        Args:
+            source: Path to the input image, its bytes, or a binary file-like object.
+            width (int): Desired image width.
+
+        Returns:
+            Image: The resized RGB image.
+
+        Raises:
+            ValueError: If the image cannot be opened.
+        """
+        source = _read_source(source)
+        if _is_bytes(source):
+            return cls._decode_resized(io.BytesIO(source), width, '<bytes>')
+
+        try:
+            mtime = os.stat(source).st_mtime_ns
+        except OSError as e:
+            raise ValueError(f"Cannot open image {source}: {e}")
+
+        return cls.base_image_cache.get_or_create(
+            (source, mtime, width),
+            lambda: cls._decode_resized(source, width, source)
+        )
+
+    @classmethod
+    def cache_stats(cls) -> dict:
+        """
+        Return hit/miss counters for the process-wide caches.
+
+        These describe this process only; with a render pool, use the
+        meme_cache_*_total metrics, which workers send back with each render.
+
+        Returns:
+            dict: Stats per cache name.
+        """
+        return {
+            'font': cls.font_cache.stats(),
+            'layout': cls.layout_cache.stats(),
+            'base_image': cls.base_image_cache.stats(),
+            'text_tile': cls.text_tile_cache.stats(),
+        }
+
+    def render_key(self, source, text: str, author: str, width: int) -> str:
+        """
+        Return a digest identifying the meme produced from these inputs.
+
+        A source path is identified by its resolved path, size and mtime, so
+        editing the file in place yields a new key; image bytes are hashed.
+
+        Args:
+            source: Path to the input image, or its bytes.
+            text (str): Quote body text.
+            author (str): Quote author.
+            width (int): Desired image width.
+
+        Returns:
+            str: A hex SHA-256 digest.
+        """
+        if _is_bytes(source):
+            image_id = (hashlib.sha256(source).hexdigest(),)
+        else:
+            try:
+                st = os.stat(source)
+            except OSError as e:
+                raise ValueError(f"Cannot open image {source}: {e}")
+            image_id = (os.path.realpath(source), st.st_size, st.st_mtime_ns)
+        parts = image_id + (
+            text, author, width, self.font_path, self.font_size,
+            self.wrap_width, self.stroke_width, self.output_format,
+        )
+        if self.save_options:
+            parts += (tuple(sorted(self.save_options.items())),)
+        if self.shadow_offset:
+            parts += (self.shadow_offset, self.shadow_blur, self.shadow_opacity)
+        return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+
+    def make_meme(self, img_path, text: str, author: str, width: int = 500) -> str:
         """
         Create a meme with quote text and save it to the output directory.
 
+        In deterministic mode an existing meme for the same inputs is returned
+        without rendering again.
+
         Args:
-            img_path (str): Path to the input image.
+            img_path: Path to the input image, its bytes, or a binary file-like object.
             text (str): Quote body text.
             author (str): Quote author.
             width (int, optional): Desired image width. Default is 500.
@@ -37,54 +422,213 @@ class MemeEngine:
         Returns:
             str: Path to the saved meme image.
         """
-        try:
-            img = Image.open(img_path)
-        except Exception as e:
-            raise ValueError(f"Cannot open image {img_path}: {e}")
-
-        # Resize image keeping aspect ratio
-        original_width, original_height = img.size
-        ratio = width / float(original_width)
-        height = int(ratio * original_height)
-        img = img.resize((width, height), Image.Resampling.LANCZOS)
-
-        draw = ImageDraw.Draw(img)
-        font_path = "./fonts/LilitaOne-Regular.ttf"
-        try:
-            font = ImageFont.truetype(font_path, size=20)
-        except IOError:
-            font = ImageFont.load_default()
+        img_path = _read_source(img_path)
+        out_path, rng, exists = self._plan(img_path, text, author, width)
+        if exists:
+            return out_path
 
-        quote = f'"{text}"\n- {author}'
-        wrapped = textwrap.fill(quote, width=40)
+        img = self._drawable_base(img_path, width)
+        self._draw_quote(img, text, author, rng)
+        self._save(img, out_path)
 
-        # Calculate text size
-        try:
-            bbox = draw.multiline_textbbox((0, 0), wrapped, font=font, stroke_width=1)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-        except AttributeError:
-            text_width, text_height = draw.multiline_textsize(wrapped, font=font)
+        prune_every(self.output_dir, self.prune_interval, self.max_files, self.max_bytes)
+        return out_path
+
+    def make_memes(self, jobs: Iterable[tuple], width: int = 500, workers: int = 1,
+                   chunk_size: int = 64) -> Iterator[tuple]:
+        """
+        Create many memes, decoding and resizing each source image only once.
+
+        Jobs are grouped by source image; every group is rendered from one
+        decoded base, reusing the cached font and rasterized text. With several
+        workers, groups (split into chunks of at most chunk_size jobs) are
+        rendered in a process pool and yielded as they finish.
+
+        Args:
+            jobs (Iterable[tuple]): (image, text, author) tuples, where image is
+                a path, bytes or a binary file-like object.
+            width (int, optional): Desired image width. Default is 500.
+            workers (int, optional): Worker processes; 1 renders in this
+                process, None uses every core.
+            chunk_size (int, optional): Most jobs sent to a worker at once.
+
+        Yields:
+            tuple: (job index, output path or None, error message or None), in
+            completion order.
+        """
+        groups = {}
+        for index, (source, text, author) in enumerate(jobs):
+            source = _read_source(source)
+            key = hashlib.sha256(source).digest() if _is_bytes(source) else source
+            groups.setdefault(key, (source, []))[1].append((index, text, author))
+
+        chunks = [
+            (source, items[start:start + chunk_size])
+            for source, items in groups.values()
+            for start in range(0, len(items), chunk_size)
+        ]
+        if workers == 1:
+            for source, items in chunks:
+                yield from self._render_group(source, items, width)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_render_group, self, source, items, width)
+                       for source, items in chunks]
+            for future in as_completed(futures):
+                yield from future.result()
+
+    def _render_group(self, source, items: list, width: int) -> list:
+        """
+        Render several quotes onto one source image.
+
+        Args:
+            source: Path to the input image or its bytes.
+            items (list): (job index, text, author) tuples.
+            width (int): Desired image width.
+
+        Returns:
+            list: (job index, output path or None, error message or None) tuples.
+        """
+        results = []
+        base = None
+        name = source if isinstance(source, str) else '<bytes>'
+        for index, text, author in items:
+            try:
+                out_path, rng, exists = self._plan(source, text, author, width)
+                if not exists:
+                    if base is None:
+                        base = self.load_base_image(source, width)
+                    img = base.copy()
+                    self._draw_quote(img, text, author, rng)
+                    self._save(img, out_path)
+                results.append((index, out_path, None))
+            except Exception as e:
+                results.append((index, None, f"{name}: {e}"))
+        prune_directory(self.output_dir, self.max_files, self.max_bytes)
+        return results
+
+    def _plan(self, source, text: str, author: str, width: int) -> tuple:
+        """
+        Choose the output path and text placement randomness for a meme.
+
+        Returns:
+            tuple: (output path, random source, whether a deterministic meme
+            for these inputs already exists and can be reused).
+        """
+        if self.deterministic:
+            key = self.render_key(source, text, author, width)
+            name = f'meme_{key[:24]}.{self.output_extension}'
+            rng = random.Random(key)
+        else:
+            name = f'meme_{secrets.token_hex(8)}.{self.output_extension}'
+            rng = random
+
+        out_path = os.path.join(self.output_dir, name)
+        if self.deterministic and os.path.exists(out_path):
+            try:
+                # Refresh mtime so pruning treats the file as recently used.
+                os.utime(out_path)
+                return out_path, rng, True
+            except FileNotFoundError:
+                pass
+        return out_path, rng, False
+
+    def _save(self, img, out_path: str):
+        """Encode img to out_path; write then rename so readers never see a partial file."""
+        data = self._encode(img).getbuffer()
+        with stage('write'):
+            tmp_path = f'{out_path}.{secrets.token_hex(4)}.part'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, out_path)
+
+    def _encode(self, img) -> io.BytesIO:
+        """Encode img with the engine's format and save options."""
+        buffer = io.BytesIO()
+        with stage('encode'):
+            img.save(buffer, format=self.output_format, **self.save_options)
+        return buffer
+
+    def render_to_buffer(self, source, text: str, author: str,
+                         width: int = 500) -> io.BytesIO:
+        """
+        Create a meme in memory without touching the output directory.
+
+        Args:
+            source: Path to the input image, its bytes, or a binary file-like object.
+            text (str): Quote body text.
+            author (str): Quote author.
+            width (int, optional): Desired image width. Default is 500.
+
+        Returns:
+            io.BytesIO: The encoded meme, positioned at the start.
+        """
+        source = _read_source(source)
+        if self.deterministic:
+            rng = random.Random(self.render_key(source, text, author, width))
+        else:
+            rng = random
+
+        img = self._drawable_base(source, width)
+        self._draw_quote(img, text, author, rng)
+
+        buffer = self._encode(img)
+        buffer.seek(0)
+        return buffer
+
+    def render(self, source, text: str, author: str, width: int = 500) -> bytes:
+        """
+        Create a meme in memory and return the encoded image bytes.
+
+        Args:
+            source: Path to the input image, its bytes, or a binary file-like object.
+            text (str): Quote body text.
+            author (str): Quote author.
+            width (int, optional): Desired image width. Default is 500.
+
+        Returns:
+            bytes: The encoded meme.
+        """
+        return self.render_to_buffer(source, text, author, width).getvalue()
+
+    @property
+    def mimetype(self) -> str:
+        """Return the MIME type of the images this engine produces."""
+        Image.init()
+        return Image.MIME[self.output_format]
+
+    def _drawable_base(self, source, width: int):
+        """Return a resized base image that is safe to draw on."""
+        img = self.load_base_image(source, width)
+        if _is_bytes(source):
+            return img
+        return img.copy()
+
+    def _draw_quote(self, img, text: str, author: str, rng=random):
+        """
+        Draw the wrapped quote onto img at a position chosen by rng.
+
+        Args:
+            img (Image): The image to draw on, modified in place.
+            text (str): Quote body text.
+            author (str): Quote author.
+            rng (random.Random, optional): Source of the text position.
+        """
+        width, height = img.size
+        shadow = None
+        if self.shadow_offset:
+            shadow = (self.shadow_offset, self.shadow_blur, self.shadow_opacity)
+        with stage('layout'):
+            tile = self.text_tile(text, author, self.font_path, self.font_size,
+                                  self.wrap_width, self.stroke_width, shadow)
 
         # Ensure text fits inside image
-        max_x = max(10, width - text_width - 10)
-        max_y = max(10, height - text_height - 10)
-
-        x = random.randint(10, max_x)
-        y = random.randint(10, max_y)
-
-        draw.multiline_text(
-            (x, y),
-            wrapped,
-            font=font,
-            fill='white',
-            stroke_fill='black',
-            stroke_width=1,
-            spacing=4
-        )
+        max_x = max(10, width - tile.width - 10)
+        max_y = max(10, height - tile.height - 10)
 
-        # Save meme to output directory
-        out_path = os.path.join(self.output_dir, f'meme_{random.randint(0, 1000000)}.jpg')
-        img.save(out_path)
+        x = rng.randint(10, max_x)
+        y = rng.randint(10, max_y)
 
-        return out_path
+        with stage('draw'):
+            tile.composite(img, (x, y))
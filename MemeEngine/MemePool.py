@@ -0,0 +1,166 @@
+"""
+MemePool.py.
+
+This module defines the MemePool class, which keeps a bounded pool of
+pre-rendered memes filled by background threads, so a request can take a
+finished meme instead of rendering one while the client waits. Pool events
+are counted in meme_pool_events_total for /metrics.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+
+from Metrics.Metrics import registry
+from .RenderExecutor import RenderQueueFull
+
+logger = logging.getLogger(__name__)
+
+POOL_EVENTS = registry.counter(
+    'meme_pool_events_total',
+    'Pre-render pool events (hit, miss, produced, discarded, error), by pool.',
+    ('pool', 'event')
+)
+
+
+class MemePool:
+    """A bounded FIFO of pre-rendered items refilled by producer threads."""
+
+    def __init__(self, produce, size: int = 8, workers: int = 1,
+                 max_age: float = 300, is_valid=None, name: str = 'default'):
+        """
+        Initialize an empty pool; call start() to begin filling it.
+
+        Args:
+            produce (callable): Zero-argument callable returning a rendered item,
+                e.g. the path returned by MemeEngine.make_meme.
+            size (int, optional): Maximum number of pooled items.
+            workers (int, optional): Producer threads refilling the pool.
+            max_age (float, optional): Seconds after which a pooled item is discarded.
+            is_valid (callable, optional): Checked on get(); items for which it
+                returns False (e.g. a pruned file) are discarded.
+            name (str, optional): Pool label in meme_pool_events_total.
+        """
+        self.produce = produce
+        self.size = size
+        self.workers = workers
+        self.max_age = max_age
+        self.is_valid = is_valid
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.produced = 0
+        self.discarded = 0
+        self.errors = 0
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._threads = []
+        self._stopped = False
+
+    def start(self):
+        """Start the producer threads; calling it again is a no-op."""
+        with self._cond:
+            if self._threads or self.size <= 0:
+                return
+            self._stopped = False
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._fill, name=f'meme-pool-{i}', daemon=True)
+                self._threads.append(thread)
+                thread.start()
+
+    def stop(self):
+        """Stop the producer threads and drop pooled items."""
+        with self._cond:
+            self._stopped = True
+            self._items.clear()
+            self._cond.notify_all()
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join()
+
+    def get(self):
+        """
+        Take the oldest fresh item from the pool.
+
+        Returns:
+            The pooled item, or None if the pool is empty and the caller should
+            render synchronously.
+        """
+        now = time.monotonic()
+        with self._cond:
+            while self._items:
+                item, created = self._items.popleft()
+                self._cond.notify()
+                if now - created > self.max_age or \
+                        (self.is_valid is not None and not self.is_valid(item)):
+                    self._discard()
+                    continue
+                self.hits += 1
+                POOL_EVENTS.inc(1, self.name, 'hit')
+                return item
+            self.misses += 1
+            POOL_EVENTS.inc(1, self.name, 'miss')
+            return None
+
+    def _fill(self):
+        """Render items while the pool has room, until the pool is stopped."""
+        backoff = 0.1
+        while True:
+            with self._cond:
+                while not self._stopped and len(self._items) >= self.size:
+                    self._cond.wait(timeout=self.max_age)
+                    self._expire()
+                if self._stopped:
+                    return
+            try:
+                item = self.produce()
+            except Exception as e:
+                # Usually a saturated render queue; back off and let requests go first.
+                with self._cond:
+                    self.errors += 1
+                POOL_EVENTS.inc(1, self.name, 'error')
+                level = logging.DEBUG if isinstance(e, RenderQueueFull) else logging.WARNING
+                logger.log(level, "Pre-rendering a meme failed: %s", e)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+                continue
+            backoff = 0.1
+            with self._cond:
+                if self._stopped:
+                    return
+                self._items.append((item, time.monotonic()))
+                self.produced += 1
+                POOL_EVENTS.inc(1, self.name, 'produced')
+
+    def _expire(self):
+        """Drop items older than max_age; the caller holds the lock."""
+        cutoff = time.monotonic() - self.max_age
+        while self._items and self._items[0][1] < cutoff:
+            self._items.popleft()
+            self._discard()
+
+    def _discard(self):
+        """Count an item dropped as stale; the caller holds the lock."""
+        self.discarded += 1
+        POOL_EVENTS.inc(1, self.name, 'discarded')
+
+    def stats(self) -> dict:
+        """
+        Return pool depth and hit-rate counters.
+
+        Returns:
+            dict: Depth, capacity, hits, misses, hit rate, produced, discarded, errors.
+        """
+        with self._cond:
+            requests = self.hits + self.misses
+            return {
+                'depth': len(self._items),
+                'size': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / requests if requests else 0.0,
+                'produced': self.produced,
+                'discarded': self.discarded,
+                'errors': self.errors,
+            }
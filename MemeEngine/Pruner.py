@@ -0,0 +1,99 @@
+"""
+Pruner.py.
+
+This module provides prune_directory, which keeps a directory of generated
+files within a file-count and/or byte budget by deleting the oldest files, and
+prune_every, which runs it only on every Nth write to a directory so a busy
+writer does not list and stat the whole directory each time.
+"""
+
+import os
+import threading
+
+# Writes seen per directory since it was last pruned, in this process.
+_writes = {}
+_writes_lock = threading.Lock()
+
+
+def prune_directory(directory: str, max_files: int = None, max_bytes: int = None) -> int:
+    """
+    Delete the least recently modified files until the directory fits its budget.
+
+    Only regular files directly inside the directory are considered, except
+    in-flight '.part' temp files that a writer is about to rename into place.
+    Files that disappear while pruning (e.g. removed by another worker) are
+    ignored.
+
+    Args:
+        directory (str): The directory to prune.
+        max_files (int, optional): Maximum number of files to keep.
+        max_bytes (int, optional): Maximum total size of the kept files.
+
+    Returns:
+        int: The number of files deleted.
+    """
+    if max_files is None and max_bytes is None:
+        return 0
+
+    entries = []
+    total = 0
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith('.part'):
+                    continue
+                try:
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+                total += st.st_size
+    except FileNotFoundError:
+        return 0
+
+    entries.sort()
+    count = len(entries)
+    removed = 0
+    for _, size, path in entries:
+        if (max_files is None or count <= max_files) and \
+                (max_bytes is None or total <= max_bytes):
+            break
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+        count -= 1
+        total -= size
+    return removed
+
+
+def prune_every(directory: str, interval: int, max_files: int = None,
+                max_bytes: int = None) -> int:
+    """
+    Record one write to directory and prune it on every interval-th write.
+
+    The first write in a process always prunes, so a directory that is already
+    over budget is trimmed straight away; afterwards it may exceed max_files by
+    up to interval files per process between prunes.
+
+    Args:
+        directory (str): The directory written to.
+        interval (int): Writes between prunes; 1 or less prunes every time.
+        max_files (int, optional): Maximum number of files to keep.
+        max_bytes (int, optional): Maximum total size of the kept files.
+
+    Returns:
+        int: The number of files deleted, 0 when this write did not prune.
+    """
+    if max_files is None and max_bytes is None:
+        return 0
+    with _writes_lock:
+        count = _writes.get(directory)
+        due = count is None or count + 1 >= interval
+        _writes[directory] = 0 if due else count + 1
+    if not due:
+        return 0
+    return prune_directory(directory, max_files, max_bytes)
@@ -0,0 +1,317 @@
+"""
+RenderExecutor.py.
+
+This module defines the RenderExecutor class, which moves CPU-bound meme
+rendering out of web request threads into a process pool sized to the cores.
+A bounded number of slots sits in front of the pool: when every slot is taken
+new work is rejected immediately, so callers can answer 503 instead of letting
+latency grow without bound. Metrics recorded in a worker are drained with each
+result and merged into this process's registry.
+"""
+
+import asyncio
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from Metrics.Metrics import registry
+
+WAIT_SECONDS = registry.histogram(
+    'meme_render_wait_seconds', 'Seconds renders waited in the queue for a worker.'
+)
+RENDER_SECONDS = registry.histogram(
+    'meme_render_seconds', 'Seconds spent rendering, by MemeEngine method.', ('method',)
+)
+REJECTED = registry.counter(
+    'meme_render_rejected_total', 'Renders rejected because the queue was full.'
+)
+TIMEOUTS = registry.counter(
+    'meme_render_timeouts_total', 'Renders that missed their deadline.'
+)
+FAILED = registry.counter(
+    'meme_render_failures_total', 'Renders that raised an exception.'
+)
+
+
+class RenderQueueFull(Exception):
+    """Raised when the render queue has no free slot."""
+
+
+class RenderTimeout(Exception):
+    """Raised when a render does not finish before its deadline."""
+
+
+def _run_render(engine, method: str, args: tuple, submitted: float,
+                collect: bool = False, profiler=None) -> tuple:
+    """
+    Run one render in a worker process.
+
+    Args:
+        engine (MemeEngine): The engine; its class-level caches persist per worker.
+        method (str): Name of the MemeEngine method to call.
+        args (tuple): Positional arguments for the method.
+        submitted (float): time.time() at submission, to measure queue wait.
+        collect (bool, optional): Drain the worker's metrics into the result.
+        profiler (Profiler, optional): Samples renders with cProfile.
+
+    Returns:
+        tuple: (result, seconds waited in queue, seconds spent rendering,
+        drained metrics or None).
+    """
+    started = time.time()
+    if profiler is None:
+        result = getattr(engine, method)(*args)
+    else:
+        with profiler.sample(f'render-{method}'):
+            result = getattr(engine, method)(*args)
+    rendered = time.time() - started
+    return result, started - submitted, rendered, registry.drain() if collect else None
+
+
+class RenderExecutor:
+    """A bounded render queue in front of a process pool."""
+
+    def __init__(self, engine, workers: int = None, max_queue: int = None,
+                 timeout: float = 10, profiler=None):
+        """
+        Initialize the executor; the process pool is created on first use.
+
+        Args:
+            engine (MemeEngine): Engine whose methods are run in the workers.
+            workers (int, optional): Worker processes; defaults to the CPU count.
+                0 renders inline in the calling thread, still bounded by the queue.
+            max_queue (int, optional): Renders allowed to wait beyond those
+                running. Defaults to twice the number of workers.
+            timeout (float, optional): Default per-request deadline in seconds.
+            profiler (Profiler, optional): Samples renders with cProfile, in
+                whichever process runs them.
+        """
+        self.engine = engine
+        self.profiler = profiler
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_queue = 2 * max(self.workers, 1) if max_queue is None else max_queue
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(self.workers, 1) + self.max_queue)
+        self._lock = threading.Lock()
+        self._pool = None
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.failed = 0
+        self.wait_seconds = 0.0
+        self.render_seconds = 0.0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Create the process pool on first use."""
+        with self._lock:
+            if self._pool is None:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context(
+                    'forkserver' if 'forkserver' in methods else 'spawn'
+                )
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            return self._pool
+
+    def submit(self, method: str, *args, engine=None, background: bool = False) -> Future:
+        """
+        Queue a render without waiting for it.
+
+        Background renders (e.g. pre-rendering) are accepted only while a worker
+        is idle and do not take a queue slot, so they never turn a request away.
+
+        Args:
+            method (str): MemeEngine method, e.g. 'make_meme' or 'render'.
+            *args: Arguments for the method.
+            engine (MemeEngine, optional): Engine to use instead of self.engine,
+                e.g. one with another output preset.
+            background (bool, optional): Submit at low priority.
+
+        Returns:
+            Future: Resolves to the method's return value. With workers=0 the
+            render has already run in the calling thread.
+
+        Raises:
+            RenderQueueFull: If every slot is taken, or for a background render,
+                if no worker is idle.
+        """
+        with self._lock:
+            if background:
+                accepted = self._in_flight < max(self.workers, 1)
+            else:
+                accepted = self._slots.acquire(blocking=False)
+                if not accepted:
+                    self.rejected += 1
+            if accepted:
+                self._in_flight += 1
+        if not accepted:
+            if background:
+                raise RenderQueueFull("No idle worker for a background render")
+            REJECTED.inc()
+            raise RenderQueueFull("Render queue is full")
+
+        engine = self.engine if engine is None else engine
+        submitted = time.time()
+        if self.workers == 0:
+            future = Future()
+            try:
+                future.set_result(_run_render(engine, method, args, submitted,
+                                              False, self.profiler))
+            except Exception as e:
+                future.set_exception(e)
+        else:
+            try:
+                future = self._get_pool().submit(_run_render, engine, method, args, submitted,
+                                                 True, self.profiler)
+            except Exception as e:
+                self._finish(failed=True, background=background)
+                if isinstance(e, BrokenProcessPool):
+                    self._discard_pool()
+                raise
+        future.add_done_callback(partial(self._on_done, method, background))
+        return future
+
+    def run(self, method: str, *args, timeout: float = None, engine=None,
+            background: bool = False):
+        """
+        Render with the engine in the pool and wait for the result.
+
+        Args:
+            method (str): MemeEngine method, e.g. 'make_meme' or 'render'.
+            *args: Arguments for the method.
+            timeout (float, optional): Deadline in seconds; defaults to self.timeout.
+            engine (MemeEngine, optional): Engine to use instead of self.engine.
+            background (bool, optional): Submit at low priority, as in submit().
+
+        Returns:
+            The method's return value.
+
+        Raises:
+            RenderQueueFull: If every slot is taken.
+            RenderTimeout: If the deadline passes first.
+        """
+        future = self.submit(method, *args, engine=engine, background=background)
+        try:
+            result, *_ = future.result(timeout=self.timeout if timeout is None else timeout)
+        except TimeoutError:
+            self._timed_out(future)
+        return result
+
+    async def arun(self, method: str, *args, timeout: float = None, engine=None):
+        """
+        Render like run, but await the result instead of blocking a thread.
+
+        Args:
+            method (str): MemeEngine method, e.g. 'make_meme' or 'render'.
+            *args: Arguments for the method.
+            timeout (float, optional): Deadline in seconds; defaults to self.timeout.
+            engine (MemeEngine, optional): Engine to use instead of self.engine.
+
+        Returns:
+            The method's return value.
+
+        Raises:
+            RenderQueueFull: If every slot is taken.
+            RenderTimeout: If the deadline passes first.
+        """
+        future = self.submit(method, *args, engine=engine)
+        try:
+            result, *_ = await asyncio.wait_for(
+                asyncio.wrap_future(future), self.timeout if timeout is None else timeout
+            )
+        except asyncio.TimeoutError:
+            self._timed_out(future)
+        return result
+
+    def _timed_out(self, future):
+        """Count a missed deadline and raise RenderTimeout."""
+        # Drop it if still queued; a running render finishes and frees its slot.
+        future.cancel()
+        with self._lock:
+            self.timeouts += 1
+        TIMEOUTS.inc()
+        raise RenderTimeout("Render did not finish before the deadline")
+
+    def _on_done(self, method: str, background: bool, future):
+        """Release the slot of a finished render and record its timings."""
+        if future.cancelled():
+            self._finish(background=background)
+        elif future.exception() is not None:
+            if isinstance(future.exception(), BrokenProcessPool):
+                self._discard_pool()
+            self._finish(failed=True, background=background)
+        else:
+            _, waited, rendered, metrics = future.result()
+            registry.merge(metrics)
+            WAIT_SECONDS.observe(waited)
+            RENDER_SECONDS.observe(rendered, method)
+            self._finish(waited, rendered, background=background)
+
+    def _finish(self, waited: float = None, rendered: float = None, failed: bool = False,
+                background: bool = False):
+        """Release a slot (background renders hold none) and update counters."""
+        with self._lock:
+            self._in_flight -= 1
+            if failed:
+                self.failed += 1
+                FAILED.inc()
+            elif rendered is not None:
+                self.completed += 1
+                self.wait_seconds += waited
+                self.render_seconds += rendered
+        if not background:
+            self._slots.release()
+
+    def _discard_pool(self):
+        """Forget a broken pool so the next render starts a fresh one."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def retry_after(self) -> int:
+        """
+        Estimate how many seconds a rejected client should wait.
+
+        Returns:
+            int: At least 1 second.
+        """
+        stats = self.stats()
+        per_render = stats['avg_render_seconds'] or 1.0
+        backlog = stats['in_flight'] / max(self.workers, 1)
+        return max(1, math.ceil(backlog * per_render))
+
+    def stats(self) -> dict:
+        """
+        Return queue depth and timing counters.
+
+        Returns:
+            dict: In-flight and queued renders, capacity, completions, rejections,
+            timeouts, failures and mean wait/render seconds.
+        """
+        with self._lock:
+            done = self.completed
+            return {
+                'in_flight': self._in_flight,
+                'queued': max(0, self._in_flight - max(self.workers, 1)),
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'completed': done,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+                'failed': self.failed,
+                'avg_wait_seconds': self.wait_seconds / done if done else 0.0,
+                'avg_render_seconds': self.render_seconds / done if done else 0.0,
+            }
+
+    def shutdown(self):
+        """Stop the process pool."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
@@ -0,0 +1,102 @@
+"""
+TextTile.py.
+
+This module defines the TextTile class: a wrapped quote rasterized once into
+coverage masks (stroke, fill and an optional drop shadow) that can be pasted
+onto any number of images at any position. Pasting a colour through each mask
+blends exactly as ImageDraw does when it draws the stroke and then the fill, so
+the result matches drawing the text directly, without re-rasterizing glyphs.
+"""
+
+import math
+from PIL import Image, ImageDraw, ImageFilter
+
+
+class TextTile:
+    """Pre-rasterized text layers pasted onto images with Image.paste."""
+
+    def __init__(self, layers: list, width: int, height: int):
+        """
+        Initialize a tile from its layers.
+
+        Args:
+            layers (list): (dx, dy, colour, mask) tuples, pasted in order; dx and
+                dy place the mask relative to the text anchor.
+            width (int): Width of the text's bounding box in pixels.
+            height (int): Height of the text's bounding box in pixels.
+        """
+        self.layers = layers
+        self.width = width
+        self.height = height
+
+    @classmethod
+    def rasterize(cls, wrapped: str, font, fill='white', stroke_fill='black',
+                  stroke_width: int = 0, spacing: int = 4, shadow_offset: int = 0,
+                  shadow_blur: float = 2, shadow_opacity: float = 0.6,
+                  shadow_fill='black') -> 'TextTile':
+        """
+        Rasterize multiline text into masks.
+
+        Args:
+            wrapped (str): The text, already wrapped into lines.
+            font (ImageFont): Font to render with.
+            fill (optional): Text colour.
+            stroke_fill (optional): Outline colour.
+            stroke_width (int, optional): Outline width in pixels; 0 for none.
+            spacing (int, optional): Pixels between lines, as in ImageDraw.
+            shadow_offset (int, optional): Drop shadow offset in pixels, down
+                and to the right; 0 for no shadow.
+            shadow_blur (float, optional): Gaussian blur radius of the shadow.
+            shadow_opacity (float, optional): Shadow opacity, 0 to 1.
+            shadow_fill (optional): Shadow colour.
+
+        Returns:
+            TextTile: The rasterized text.
+        """
+        measure = ImageDraw.Draw(Image.new('L', (1, 1)))
+        left, top, right, bottom = measure.multiline_textbbox(
+            (0, 0), wrapped, font=font, stroke_width=stroke_width, spacing=spacing
+        )
+        size = (max(1, right - left), max(1, bottom - top))
+        origin = (-left, -top)
+
+        # One pass renders both masks: the stroke adds only alpha, the fill then
+        # sets luminance to its coverage, so L holds the fill and A the outline.
+        tile = Image.new('LA', size)
+        ImageDraw.Draw(tile).multiline_text(
+            origin, wrapped, font=font, fill=(255, 255), stroke_width=stroke_width,
+            stroke_fill=(0, 255), spacing=spacing
+        )
+        fill_mask, outline = tile.split()
+        layers = [(left, top, fill, fill_mask)]
+        if stroke_width:
+            layers.insert(0, (left, top, stroke_fill, outline))
+
+        if shadow_offset:
+            margin = math.ceil(3 * shadow_blur)
+            shadow = Image.new('L', (size[0] + 2 * margin, size[1] + 2 * margin))
+            shadow.paste(outline, (margin, margin))
+            if shadow_blur:
+                shadow = shadow.filter(ImageFilter.GaussianBlur(shadow_blur))
+            shadow = shadow.point(lambda v: round(v * shadow_opacity))
+            layers.insert(0, (left - margin + shadow_offset, top - margin + shadow_offset,
+                              shadow_fill, shadow))
+
+        return cls(layers, right - left, bottom - top)
+
+    def composite(self, img, xy: tuple):
+        """
+        Paste the text onto img, clipped to its bounds.
+
+        Args:
+            img (Image): The image to draw on, modified in place.
+            xy (tuple): Anchor of the text, as passed to ImageDraw.multiline_text.
+        """
+        x, y = xy
+        for dx, dy, colour, mask in self.layers:
+            img.paste(colour, (x + dx, y + dy), mask)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory held by the masks in bytes."""
+        return sum(mask.width * mask.height for _, _, _, mask in self.layers)
@@ -0,0 +1,358 @@
+"""
+Metrics.py.
+
+This module defines lightweight, thread-safe counters, gauges and histograms
+kept in a process-wide Registry and rendered in the Prometheus text format.
+Worker processes cannot update the parent's registry, so they drain() their
+own after a unit of work and return the result for the parent to merge().
+"""
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Iterable
+
+# Upper bounds in seconds, from sub-millisecond stages to slow fetches.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = '') -> str:
+    """Return '{name="value",...}', or '' when there are no labels."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value, using Prometheus spellings for infinities."""
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base class for a named metric with a fixed set of label names."""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        """
+        Initialize an empty metric.
+
+        Args:
+            name (str): Metric name, e.g. 'meme_stage_seconds'.
+            help (str): One-line description shown in the exposition.
+            labelnames (Iterable[str], optional): Names of the labels.
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labelvalues: tuple) -> tuple:
+        """Check the label values against labelnames and return them as strings."""
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {labelvalues}"
+            )
+        return tuple(str(value) for value in labelvalues)
+
+    def spec(self) -> tuple:
+        """Return what merge() needs to recreate this metric in another registry."""
+        return self.kind, self.help, self.labelnames
+
+    def drain(self) -> dict:
+        """Return the current values and reset them."""
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def samples(self) -> list:
+        """Return (suffix, label string, value) tuples for the exposition."""
+        with self._lock:
+            return [('', _format_labels(self.labelnames, key), value)
+                    for key, value in sorted(self._values.items())]
+
+
+class Counter(Metric):
+    """A monotonically increasing count per label set."""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, *labelvalues):
+        """
+        Add amount to the count for the given label values.
+
+        Args:
+            amount (float, optional): Non-negative increment. Default is 1.
+            *labelvalues: One value per label name, in order.
+        """
+        key = self._key(labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, *labelvalues) -> float:
+        """Return the count for the given label values."""
+        with self._lock:
+            return self._values.get(self._key(labelvalues), 0)
+
+    def merge(self, values: dict):
+        """Add drained counts from another process."""
+        with self._lock:
+            for key, value in values.items():
+                self._values[key] = self._values.get(key, 0) + value
+
+
+class Gauge(Metric):
+    """A value that is set rather than accumulated, e.g. a queue depth."""
+
+    kind = 'gauge'
+
+    def set(self, value: float, *labelvalues):
+        """
+        Set the value for the given label values.
+
+        Args:
+            value (float): The current value.
+            *labelvalues: One value per label name, in order.
+        """
+        key = self._key(labelvalues)
+        with self._lock:
+            self._values[key] = value
+
+    def drain(self) -> dict:
+        """Return nothing: a gauge describes its own process and is not merged."""
+        return {}
+
+    def merge(self, values: dict):
+        """Ignore gauges from other processes."""
+
+
+class Histogram(Metric):
+    """Observations counted into cumulative buckets, with their sum and count."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            name (str): Metric name, e.g. 'meme_stage_seconds'.
+            help (str): One-line description shown in the exposition.
+            labelnames (Iterable[str], optional): Names of the labels.
+            buckets (Iterable[float], optional): Bucket upper bounds; +Inf is implied.
+        """
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def spec(self) -> tuple:
+        """Return what merge() needs to recreate this metric in another registry."""
+        return self.kind, self.help, self.labelnames, self.buckets
+
+    def observe(self, value: float, *labelvalues):
+        """
+        Record one observation.
+
+        Args:
+            value (float): The observed value, usually seconds.
+            *labelvalues: One value per label name, in order.
+        """
+        key = self._key(labelvalues)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (the last one is +Inf), then sum and count.
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, *labelvalues):
+        """
+        Observe the wall-clock seconds spent in a with block.
+
+        Args:
+            *labelvalues: One value per label name, in order.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labelvalues)
+
+    def get(self, *labelvalues) -> tuple:
+        """Return (count, sum) for the given label values."""
+        with self._lock:
+            state = self._values.get(self._key(labelvalues))
+            return (state[-1], state[-2]) if state else (0, 0.0)
+
+    def merge(self, values: dict):
+        """Add drained observations from another process."""
+        with self._lock:
+            for key, other in values.items():
+                state = self._values.get(key)
+                if state is None:
+                    self._values[key] = list(other)
+                else:
+                    for i, value in enumerate(other):
+                        state[i] += value
+
+    def samples(self) -> list:
+        """Return (suffix, label string, value) tuples for the exposition."""
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        samples = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), state):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                samples.append(('_bucket', _format_labels(self.labelnames, key, le),
+                                cumulative))
+            labels = _format_labels(self.labelnames, key)
+            samples.append(('_sum', labels, state[-2]))
+            samples.append(('_count', labels, state[-1]))
+        return samples
+
+
+class Registry:
+    """A named collection of metrics."""
+
+    types = {'counter': Counter, 'gauge': Gauge, 'histogram': Histogram}
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs) -> Metric:
+        """Return the metric called name, creating it on first use."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif type(metric) is not cls:
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        """
+        Return the counter called name, registering it on first use.
+
+        Args:
+            name (str): Metric name.
+            help (str): One-line description.
+            labelnames (Iterable[str], optional): Names of the labels.
+
+        Returns:
+            Counter: The shared counter.
+        """
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Gauge:
+        """
+        Return the gauge called name, registering it on first use.
+
+        Args:
+            name (str): Metric name.
+            help (str): One-line description.
+            labelnames (Iterable[str], optional): Names of the labels.
+
+        Returns:
+            Gauge: The shared gauge.
+        """
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        """
+        Return the histogram called name, registering it on first use.
+
+        Args:
+            name (str): Metric name.
+            help (str): One-line description.
+            labelnames (Iterable[str], optional): Names of the labels.
+            buckets (Iterable[float], optional): Bucket upper bounds.
+
+        Returns:
+            Histogram: The shared histogram.
+        """
+        return self._get_or_create(Histogram, name, help, labelnames, buckets)
+
+    def drain(self) -> dict:
+        """
+        Return every counter and histogram value recorded so far and reset them.
+
+        Returns:
+            dict: Picklable snapshot for merge(); empty metrics are left out.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        snapshot = {}
+        for metric in metrics:
+            values = metric.drain()
+            if values:
+                snapshot[metric.name] = (metric.spec(), values)
+        return snapshot
+
+    def merge(self, snapshot: dict):
+        """
+        Add values drained from another process's registry.
+
+        Args:
+            snapshot (dict): The result of drain(); unknown metrics are registered.
+        """
+        for name, ((kind, *spec), values) in (snapshot or {}).items():
+            self._get_or_create(self.types[kind], name, *spec).merge(values)
+
+    def render(self) -> str:
+        """
+        Return every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition, ending with a newline.
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for suffix, labels, value in metric.samples():
+                lines.append(f'{metric.name}{suffix}{labels} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+# The process-wide registry, shared by MemeEngine, QuoteEngine and the web apps.
+registry = Registry()
+
+STAGE_SECONDS = registry.histogram(
+    'meme_stage_seconds', 'Seconds spent in each meme rendering stage.', ('stage',)
+)
+
+
+def stage(name: str):
+    """
+    Time a rendering stage into meme_stage_seconds.
+
+    Args:
+        name (str): Stage name: decode, resize, layout, draw, encode, write or fetch.
+
+    Returns:
+        A context manager observing the time spent in its block.
+    """
+    return STAGE_SECONDS.time(name)
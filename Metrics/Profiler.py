@@ -0,0 +1,94 @@
+"""
+Profiler.py.
+
+This module defines the Profiler class, which runs cProfile on a random
+fraction of requests or renders and dumps each sample to a .prof file that
+pstats or snakeviz can open. At most one sample is taken at a time per
+process, so the overhead stays bounded whatever the rate.
+"""
+
+import cProfile
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Held while a sample is running in this process.
+_active = threading.Lock()
+
+
+class Profiler:
+    """Sample cProfile runs at a fixed rate."""
+
+    def __init__(self, rate: float = 0.0, directory: str = './.cache/profiles'):
+        """
+        Initialize the profiler; a rate of 0 disables it.
+
+        Args:
+            rate (float, optional): Fraction of calls to profile, 0 to 1.
+            directory (str, optional): Where .prof files are written.
+        """
+        self.rate = rate
+        self.directory = directory
+
+    def start(self):
+        """
+        Start a sample with probability rate.
+
+        Returns:
+            cProfile.Profile: The running profile, or None when this call is
+            not sampled or another sample is already running.
+        """
+        if self.rate <= 0 or random.random() >= self.rate:
+            return None
+        if not _active.acquire(blocking=False):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler (e.g. a debugger) is active in this thread.
+            _active.release()
+            return None
+        return profile
+
+    def stop(self, profile, label: str):
+        """
+        Stop a sample started by start() and write it to the directory.
+
+        Args:
+            profile (cProfile.Profile): The running profile, or None.
+            label (str): Describes what was profiled, e.g. a route or method name.
+        """
+        if profile is None:
+            return
+        try:
+            profile.disable()
+            os.makedirs(self.directory, exist_ok=True)
+            name = re.sub(r'[^A-Za-z0-9_.-]+', '_', label).strip('_') or 'sample'
+            path = os.path.join(self.directory,
+                                f'{name}-{os.getpid()}-{time.time_ns()}.prof')
+            profile.dump_stats(path)
+        except OSError as e:
+            logger.warning("Cannot write profile: %s", e)
+        finally:
+            _active.release()
+
+    @contextmanager
+    def sample(self, label: str):
+        """
+        Profile the with block if this call is sampled.
+
+        Args:
+            label (str): Describes what was profiled; used in the file name.
+        """
+        profile = self.start()
+        try:
+            yield
+        finally:
+            self.stop(profile, label)
@@ -0,0 +1,6 @@
+"""
+Metrics package.
+
+Provides in-process counters, gauges and histograms exposed in the Prometheus
+text format, and sampled cProfile capture.
+"""
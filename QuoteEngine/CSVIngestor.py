@@ -2,11 +2,13 @@
 csv_ingestor module.
 
 This module ingests quotes from CSV files by implementing the CSVIngestor class,
-which parses the file and returns QuoteModel instances.
+which streams rows with the standard csv module and yields QuoteModel instances.
+pandas can be selected as a backend instead; it reads the file in chunks and is
+imported only when used.
 """
 
-import pandas as pd
-from typing import List
+import csv
+from typing import Iterator, List
 from .IngestorInterface import IngestorInterface
 from .QuoteModel import QuoteModel
 
@@ -16,6 +18,11 @@ class CSVIngestor(IngestorInterface):
 
     allowed_extensions = ['csv']
 
+    # 'csv' streams rows with the standard library; 'pandas' reads chunks with read_csv.
+    backends = ('csv', 'pandas')
+    backend = 'csv'
+    pandas_chunk_rows = 10_000
+
     @classmethod
     def can_ingest(cls, path: str) -> bool:
         """
@@ -40,5 +47,65 @@ class CSVIngestor(IngestorInterface):
         Returns:
             List[QuoteModel]: List of QuoteModel objects parsed from the file.
         """
-        df = pd.read_csv(path)
-        return [QuoteModel(row['body'], row['author']) for _, row in df.iterrows()]
\ No newline at end of file
+        return list(cls.iter_parse(path))
+
+    @classmethod
+    def iter_parse(cls, path: str, backend: str = None) -> Iterator[QuoteModel]:
+        """
+        Stream a CSV file with 'body' and 'author' columns, one row at a time.
+
+        Rows missing either value are skipped.
+
+        Args:
+            path (str): The path to the CSV file.
+            backend (str, optional): 'csv' or 'pandas'; defaults to cls.backend.
+
+        Yields:
+            QuoteModel: One quote per row.
+
+        Raises:
+            ValueError: If the backend name is unknown or a column is missing.
+        """
+        backend = backend or cls.backend
+        if backend not in cls.backends:
+            raise ValueError(f"Unknown CSV backend: {backend}")
+        if backend == 'pandas':
+            yield from cls._iter_pandas(path)
+            return
+
+        with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if header is None:
+                return
+            header = [name.strip() for name in header]
+            try:
+                body_col = header.index('body')
+                author_col = header.index('author')
+            except ValueError:
+                raise ValueError(f"CSV file needs 'body' and 'author' columns: {path}")
+            width = max(body_col, author_col) + 1
+            for row in reader:
+                if len(row) < width:
+                    continue
+                body, author = row[body_col], row[author_col]
+                if body and author:
+                    yield QuoteModel(body, author)
+
+    @classmethod
+    def _iter_pandas(cls, path: str) -> Iterator[QuoteModel]:
+        """Yield quotes from read_csv chunks of pandas_chunk_rows rows."""
+        import pandas as pd
+
+        try:
+            chunks = pd.read_csv(path, dtype=str, keep_default_na=False, encoding='utf-8-sig',
+                                 chunksize=cls.pandas_chunk_rows)
+        except pd.errors.EmptyDataError:
+            return
+        for chunk in chunks:
+            chunk.columns = [str(name).strip() for name in chunk.columns]
+            if 'body' not in chunk.columns or 'author' not in chunk.columns:
+                raise ValueError(f"CSV file needs 'body' and 'author' columns: {path}")
+            for body, author in zip(chunk['body'], chunk['author']):
+                if body and author:
+                    yield QuoteModel(body, author)
@@ -0,0 +1,141 @@
+"""
+corpus_reloader module.
+
+This module provides the CorpusReloader class, which keeps an in-memory quote
+corpus and photo list up to date by polling file mtimes and rescanning an
+ImageCatalog. Only quote files that changed are reparsed and only directories
+whose listing changed are rescanned; the new corpus is swapped in with a single assignment,
+so requests in flight keep using the version they started with.
+"""
+
+import logging
+import os
+import threading
+from typing import Iterable, List, Tuple
+from .QuoteStore import QuoteStore
+
+logger = logging.getLogger(__name__)
+
+
+class CorpusReloader:
+    """Incrementally reload quote files and image directories on change."""
+
+    def __init__(self, quote_files: Iterable[str], catalog, interval: float = 2.0,
+                 snapshot=None):
+        """
+        Initialize the reloader and perform the first full load.
+
+        Args:
+            quote_files (Iterable[str]): Quote files to watch.
+            catalog (ImageCatalog): Index of the photo directories to watch.
+            interval (float, optional): Seconds between polls once started.
+            snapshot (CorpusSnapshot, optional): Persist reparsed files here so
+                the next cold start benefits as well.
+        """
+        self.quote_files = list(quote_files)
+        self.catalog = catalog
+        self.interval = interval
+        self.snapshot = snapshot
+        self._file_state = {}
+        self._file_quotes = {}
+        self._current = (QuoteStore(), self.catalog.images())
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.reload()
+
+    def current(self) -> Tuple[QuoteStore, List[str]]:
+        """
+        Return the latest (quotes, images) pair.
+
+        Returns:
+            tuple: A QuoteStore and a list of image paths; both must be treated
+            as read-only.
+        """
+        return self._current
+
+    def reload(self) -> bool:
+        """
+        Reparse changed quote files and rescan changed directories.
+
+        Returns:
+            bool: True if a new corpus was swapped in.
+        """
+        quotes_changed = self._reload_quotes()
+        images_changed = self.catalog.scan()
+        if not (quotes_changed or images_changed):
+            return False
+
+        quotes = self._current[0]
+        if quotes_changed:
+            quotes = QuoteStore()
+            for path in self.quote_files:
+                quotes.extend(self._file_quotes.get(path, ()))
+        images = self.catalog.images() if images_changed else self._current[1]
+        self._current = (quotes, images)
+        return True
+
+    def _reload_quotes(self) -> bool:
+        """Reparse quote files whose size or mtime changed."""
+        changed = []
+        for path in self.quote_files:
+            try:
+                st = os.stat(path)
+                state = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                state = None
+            if state != self._file_state.get(path, False):
+                changed.append(path)
+                self._file_state[path] = state
+
+        if not changed:
+            return False
+
+        present = [path for path in changed if self._file_state[path] is not None]
+        for path in changed:
+            if self._file_state[path] is None:
+                self._file_quotes.pop(path, None)
+        if present:
+            if self.snapshot is not None:
+                report = self.snapshot.load(present)
+            else:
+                from .Ingestor import Ingestor
+                report = Ingestor.parse_many(present)
+            start = 0
+            for path in present:
+                count = report.counts.get(path, 0)
+                if path in report.errors:
+                    # Keep serving the previous quotes until the file changes again.
+                    logger.warning("Error parsing %s: %s", path, report.errors[path])
+                else:
+                    self._file_quotes[path] = report.quotes[start:start + count]
+                start += count
+        return True
+
+    def start(self):
+        """Start polling in a daemon thread; calling it again is a no-op."""
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='corpus-reloader',
+                                            daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the polling thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        """Poll for changes until stopped."""
+        while not self._stop.wait(self.interval):
+            try:
+                if self.reload():
+                    quotes, images = self._current
+                    logger.info("Reloaded corpus: %d quotes, %d images",
+                                len(quotes), len(images))
+            except Exception:
+                logger.exception("Corpus reload failed")
@@ -0,0 +1,140 @@
+"""
+corpus_snapshot module.
+
+This module provides the CorpusSnapshot class, a compiled JSON snapshot of the
+quotes parsed from a set of source files. Sources are keyed by path, size,
+mtime and content hash, so startup only reparses files that actually changed
+and does not need the heavy PDF, DOCX or CSV parsers otherwise.
+"""
+
+import hashlib
+import json
+import os
+import secrets
+from typing import Iterable
+from .IngestReport import IngestReport
+from .QuoteModel import QuoteModel
+
+SNAPSHOT_VERSION = 1
+
+
+def _file_sha256(path: str) -> str:
+    """Return the hex SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CorpusSnapshot:
+    """A persistent cache of parsed quotes keyed by source file identity."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the snapshot stored at path.
+
+        Args:
+            path (str): Location of the snapshot file; created on first save.
+        """
+        self.path = path
+        self.sources = self._read()
+
+    def _read(self) -> dict:
+        """Load the snapshot file, returning an empty mapping if unusable."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != SNAPSHOT_VERSION:
+            return {}
+        return data.get('sources', {})
+
+    def save(self):
+        """Write the snapshot atomically, so concurrent readers never see a partial file."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{self.path}.{secrets.token_hex(4)}.part'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': SNAPSHOT_VERSION, 'sources': self.sources}, f,
+                      ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def _is_current(self, key: str, st: os.stat_result) -> bool:
+        """Return True if the cached entry for key still matches the file on disk."""
+        entry = self.sources.get(key)
+        if entry is None:
+            return False
+        if entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            return True
+        # Touched but possibly unchanged (e.g. a fresh checkout): compare contents.
+        if entry['size'] == st.st_size and entry['sha256'] == _file_sha256(key):
+            entry['mtime_ns'] = st.st_mtime_ns
+            return True
+        return False
+
+    def load(self, paths: Iterable[str], max_workers: int = None) -> IngestReport:
+        """
+        Return the quotes of every path, reparsing only changed files.
+
+        Changed or new files are parsed with Ingestor.parse_many and the
+        snapshot is rewritten; files that fail to parse are reported and left
+        out of the snapshot so they are retried next time.
+
+        Args:
+            paths (Iterable[str]): The quote source files.
+            max_workers (int, optional): Pool size used for reparsing.
+
+        Returns:
+            IngestReport: Quotes in input file order; timings cover reparsed files only.
+        """
+        paths = list(paths)
+        report = IngestReport()
+        stale = {}
+        dirty = False
+        for path in paths:
+            key = os.path.realpath(path)
+            try:
+                st = os.stat(key)
+            except OSError as e:
+                report.errors[path] = f"{type(e).__name__}: {e}"
+                continue
+            before = self.sources.get(key, {}).get('mtime_ns')
+            if self._is_current(key, st):
+                dirty = dirty or before != st.st_mtime_ns
+            else:
+                stale[path] = st
+
+        if stale:
+            # Imported lazily so warm starts never load the format backends.
+            from .Ingestor import Ingestor
+            parsed = Ingestor.parse_many(stale, max_workers=max_workers)
+            report.timings.update(parsed.timings)
+            report.errors.update(parsed.errors)
+            start = 0
+            for path, st in stale.items():
+                end = start + parsed.counts[path]
+                if path not in parsed.errors:
+                    key = os.path.realpath(path)
+                    self.sources[key] = {
+                        'size': st.st_size,
+                        'mtime_ns': st.st_mtime_ns,
+                        'sha256': _file_sha256(key),
+                        'quotes': [[q.body, q.author] for q in parsed.quotes[start:end]],
+                    }
+                    dirty = True
+                start = end
+
+        for path in paths:
+            entry = self.sources.get(os.path.realpath(path))
+            if entry is None or path in report.errors:
+                continue
+            quotes = [QuoteModel(body, author) for body, author in entry['quotes']]
+            report.quotes.extend(quotes)
+            report.counts[path] = len(quotes)
+
+        if dirty:
+            self.save()
+        return report
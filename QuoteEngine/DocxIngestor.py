@@ -43,7 +43,7 @@ class DocxIngestor(IngestorInterface):
         doc = docx.Document(path)
         quotes = []
         for para in doc.paragraphs:
-            if para.text and '-' in para.text:
-                body, author = para.text.strip().split(' - ')
-                quotes.append(QuoteModel(body.strip('" '), author.strip()))
+            quote = cls.parse_line(para.text, path)
+            if quote is not None:
+                quotes.append(quote)
         return quotes
@@ -0,0 +1,37 @@
+"""This module defines the IngestReport class returned by Ingestor.parse_many."""
+
+from typing import Dict, List
+from .QuoteModel import QuoteModel
+
+
+class IngestReport:
+    """Merged quotes from several files plus per-file timing and errors."""
+
+    def __init__(self):
+        """Initialize an empty report."""
+        self.quotes: List[QuoteModel] = []
+        self.timings: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, str] = {}
+
+    @property
+    def ok(self) -> bool:
+        """Return True if every file was parsed without error."""
+        return not self.errors
+
+    def __str__(self) -> str:
+        """
+        Return a one-line-per-file summary of the ingestion.
+
+        Returns:
+            str: Timing, quote count or error for each file.
+        """
+        lines = []
+        for path, seconds in self.timings.items():
+            if path in self.errors:
+                status = f"error: {self.errors[path]}"
+            else:
+                status = f"{self.counts[path]} quotes"
+            lines.append(f"{path}: {seconds * 1000:.1f} ms, {status}")
+        lines.append(f"{len(self.quotes)} quotes total")
+        return '\n'.join(lines)
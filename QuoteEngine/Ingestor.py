@@ -3,15 +3,58 @@ ingestor module.
 
 Provides the Ingestor class that delegates file parsing to specific ingestor
 classes based on file type (e.g., TXT, CSV, DOCX, PDF).
+
+Format backends are registered by extension and imported only the first time a
+matching file is parsed, so reading a TXT file never loads pandas or python-docx.
+Parse time, quote counts and failures are recorded per format in the process
+metrics registry.
 """
 
-from typing import List
+import importlib
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Iterable, Iterator, List
+
+from Metrics.Metrics import registry as metrics_registry
+from .IngestReport import IngestReport
 from .IngestorInterface import IngestorInterface
 from .QuoteModel import QuoteModel
-from .TextIngestor import TextIngestor
-from .CSVIngestor import CSVIngestor
-from .DocxIngestor import DocxIngestor
-from .PDFIngestor import PDFIngestor
+
+PARSE_SECONDS = metrics_registry.histogram(
+    'quote_parse_seconds', 'Seconds spent parsing a quote file, by format.', ('format',)
+)
+PARSE_QUOTES = metrics_registry.counter(
+    'quote_parse_quotes_total', 'Quotes parsed, by file format.', ('format',)
+)
+PARSE_ERRORS = metrics_registry.counter(
+    'quote_parse_errors_total', 'Quote files that failed to parse, by format.', ('format',)
+)
+
+
+def _timed_parse(path: str, collect: bool = False) -> tuple:
+    """
+    Parse one file with Ingestor, capturing its duration and any error.
+
+    Args:
+        path (str): The path to the file to parse.
+        collect (bool, optional): Drain this process's metrics into the result,
+            for parses run in a worker process.
+
+    Returns:
+        tuple: (quotes, seconds, error message or None, drained metrics or None).
+    """
+    start = time.perf_counter()
+    try:
+        quotes = Ingestor.parse(path)
+        error = None
+    except Exception as e:
+        quotes = []
+        error = f"{type(e).__name__}: {e}"
+    seconds = time.perf_counter() - start
+    return quotes, seconds, error, metrics_registry.drain() if collect else None
 
 
 class Ingestor(IngestorInterface):
@@ -22,25 +65,83 @@ class Ingestor(IngestorInterface):
     formats: TXT, CSV, DOCX, and PDF.
     """
 
-    ingestors = [TextIngestor, CSVIngestor, DocxIngestor, PDFIngestor]
+    # Extension -> (module, class name) of the backend handling it.
+    registry = {
+        'txt': ('.TextIngestor', 'TextIngestor'),
+        'csv': ('.CSVIngestor', 'CSVIngestor'),
+        'docx': ('.DocxIngestor', 'DocxIngestor'),
+        'pdf': ('.PDFIngestor', 'PDFIngestor'),
+    }
+    _loaded = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def register(cls, extension: str, module: str, name: str):
+        """
+        Register the backend class used for files with the given extension.
+
+        The module is not imported until such a file is parsed.
+
+        Args:
+            extension (str): File extension without the dot, e.g. 'csv'.
+            module (str): Module path of the backend, relative to QuoteEngine
+                when it starts with a dot.
+            name (str): Class name of the backend within the module.
+        """
+        extension = extension.lower()
+        with cls._lock:
+            cls.registry[extension] = (module, name)
+            cls._loaded.pop(extension, None)
+
+    @staticmethod
+    def _extension(path: str) -> str:
+        """Return the lower-cased extension of path without the dot."""
+        return os.path.splitext(path)[1][1:].lower()
+
+    @classmethod
+    def ingestor_for(cls, path: str):
+        """
+        Return the backend class for path, importing it on first use.
+
+        Args:
+            path (str): The path to the file to parse.
+
+        Returns:
+            type: The IngestorInterface subclass handling the file.
+
+        Raises:
+            ValueError: If no ingestor can handle the file type.
+        """
+        extension = cls._extension(path)
+        ingestor = cls._loaded.get(extension)
+        if ingestor is None:
+            if extension not in cls.registry:
+                raise ValueError(f"File format not supported: {path}")
+            with cls._lock:
+                module, name = cls.registry[extension]
+                ingestor = getattr(importlib.import_module(module, __package__), name)
+                cls._loaded[extension] = ingestor
+        return ingestor
 
     @classmethod
     def can_ingest(cls, path: str) -> bool:
         """
         Check if any sub-ingestor can handle the given file path.
 
+        This does not import the backend.
+
         Args:
             path (str): The file path to check.
 
         Returns:
             bool: True if an ingestor can handle the file, False otherwise.
         """
-        return any(ing.can_ingest(path) for ing in cls.ingestors)
+        return cls._extension(path) in cls.registry
 
     @classmethod
     def parse(cls, path: str) -> List[QuoteModel]:
         """
-        Parse the file using the first matching sub-ingestor.
+        Parse the file using the sub-ingestor registered for its extension.
 
         Args:
             path (str): The path to the file to parse.
@@ -51,7 +152,71 @@ class Ingestor(IngestorInterface):
         Raises:
             ValueError: If no ingestor can handle the file type.
         """
-        for ingestor in cls.ingestors:
-            if ingestor.can_ingest(path):
-                return ingestor.parse(path)
-        raise ValueError(f"File format not supported: {path}")
+        ingestor = cls.ingestor_for(path)
+        fmt = cls._extension(path)
+        try:
+            with PARSE_SECONDS.time(fmt):
+                quotes = ingestor.parse(path)
+        except Exception:
+            PARSE_ERRORS.inc(1, fmt)
+            raise
+        PARSE_QUOTES.inc(len(quotes), fmt)
+        return quotes
+
+    @classmethod
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Lazily yield quotes from the file using its sub-ingestor.
+
+        Streaming backends (TXT, CSV) hold only one row in memory at a time,
+        which keeps memory flat for very large exports.
+
+        Args:
+            path (str): The path to the file to parse.
+
+        Yields:
+            QuoteModel: Parsed quotes, in file order.
+
+        Raises:
+            ValueError: If no ingestor can handle the file type.
+        """
+        return cls.ingestor_for(path).iter_parse(path)
+
+    @classmethod
+    def parse_many(cls, paths: Iterable[str], max_workers: int = None,
+                   processes: bool = False) -> IngestReport:
+        """
+        Parse several files concurrently and merge the results.
+
+        Threads suit file I/O and the pdftotext fallback, which waits on a
+        subprocess; processes help when CPU-bound parsing (large DOCX files or
+        in-process PDF extraction) dominates.
+        Errors are recorded per file instead of being raised.
+
+        Args:
+            paths (Iterable[str]): The files to parse.
+            max_workers (int, optional): Pool size; defaults to one per file.
+            processes (bool, optional): Use a process pool instead of threads.
+
+        Returns:
+            IngestReport: Quotes in input file order, plus per-file timings,
+            quote counts and errors.
+        """
+        paths = list(paths)
+        report = IngestReport()
+        if not paths:
+            return report
+
+        workers = max_workers or min(len(paths), (os.cpu_count() or 1) + 4)
+        pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        with pool(max_workers=workers) as executor:
+            results = list(executor.map(partial(_timed_parse, collect=processes), paths))
+
+        for path, (quotes, seconds, error, metrics) in zip(paths, results):
+            metrics_registry.merge(metrics)
+            report.quotes.extend(quotes)
+            report.timings[path] = seconds
+            report.counts[path] = len(quotes)
+            if error:
+                report.errors[path] = error
+        return report
@@ -1,9 +1,12 @@
 """This module defines the abstract base class for quote ingestors."""
 
+import logging
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List, Optional
 from .QuoteModel import QuoteModel
 
+logger = logging.getLogger(__name__)
+
 
 class IngestorInterface(ABC):
     """Abstract base class for all quote ingestors."""
@@ -37,3 +40,43 @@ class IngestorInterface(ABC):
             List[QuoteModel]: Parsed quotes.
         """
         pass
+
+    @classmethod
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Yield QuoteModel instances from the file one at a time.
+
+        Backends that can stream override this; the default parses the whole
+        file first.
+
+        Args:
+            path (str): The file path to parse.
+
+        Yields:
+            QuoteModel: Parsed quotes.
+        """
+        yield from cls.parse(path)
+
+    @staticmethod
+    def parse_line(line: str, path: str = '') -> Optional[QuoteModel]:
+        """
+        Parse one 'body - author' line.
+
+        The author is taken from the last ' - ', so a body may contain the
+        separator itself. Lines without a body or author are logged and skipped.
+
+        Args:
+            line (str): The line of text.
+            path (str, optional): The file it came from, for the warning.
+
+        Returns:
+            QuoteModel: The quote, or None if the line holds no quote.
+        """
+        if ' - ' not in line:
+            return None
+        body, _, author = line.rpartition(' - ')
+        body, author = body.strip('" \t\n'), author.strip()
+        if not body or not author:
+            logger.warning("Skipping malformed quote in %s: %r", path, line.strip())
+            return None
+        return QuoteModel(body, author)
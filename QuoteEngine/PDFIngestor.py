@@ -2,13 +2,13 @@
 pdf_ingestor module.
 
 This module provides functionality to parse PDF files and extract quotes
-into QuoteModel instances using the pdftotext utility.
+into QuoteModel instances. Text is extracted in-process with PyPDF2, page by
+page, with the pdftotext utility available as a selectable fallback.
 """
 
 import subprocess
-import os
-from typing import List
-from tempfile import TemporaryDirectory
+import tempfile
+from typing import Iterable, Iterator, List
 from .IngestorInterface import IngestorInterface
 from .QuoteModel import QuoteModel
 
@@ -18,6 +18,10 @@ class PDFIngestor(IngestorInterface):
 
     allowed_extensions = ['pdf']
 
+    # 'pypdf' extracts in-process; 'pdftotext' shells out to poppler.
+    backends = ('pypdf', 'pdftotext')
+    backend = 'pypdf'
+
     @classmethod
     def can_ingest(cls, path: str) -> bool:
         """
@@ -42,14 +46,70 @@ class PDFIngestor(IngestorInterface):
         Returns:
             List[QuoteModel]: A list of quotes extracted from the PDF.
         """
-        quotes = []
-        with TemporaryDirectory() as tmpdir:
-            temp_txt = os.path.join(tmpdir, "output.txt")
-            subprocess.run(['pdftotext', path, temp_txt], check=True)
-
-            with open(temp_txt, 'r') as file:
-                for line in file:
-                    if '-' in line:
-                        body, author = line.strip().split(' - ')
-                        quotes.append(QuoteModel(body.strip('" '), author.strip()))
-        return quotes
+        return list(cls.iter_parse(path))
+
+    @classmethod
+    def iter_parse(cls, path: str, backend: str = None) -> Iterator[QuoteModel]:
+        """
+        Yield quotes from a PDF as its text is extracted.
+
+        Only one page (pypdf) or one line (pdftotext) of text is held at a time.
+        If PyPDF2 is not installed the pdftotext backend is used instead.
+
+        Args:
+            path (str): The path to the PDF file.
+            backend (str, optional): 'pypdf' or 'pdftotext'; defaults to cls.backend.
+
+        Yields:
+            QuoteModel: Quotes in document order.
+
+        Raises:
+            ValueError: If the backend name is unknown.
+        """
+        backend = backend or cls.backend
+        if backend not in cls.backends:
+            raise ValueError(f"Unknown PDF backend: {backend}")
+
+        if backend == 'pypdf':
+            try:
+                lines = cls._pypdf_lines(path)
+            except ImportError:
+                lines = cls._pdftotext_lines(path)
+        else:
+            lines = cls._pdftotext_lines(path)
+
+        for line in lines:
+            quote = cls.parse_line(line, path)
+            if quote is not None:
+                yield quote
+
+    @staticmethod
+    def _pypdf_lines(path: str) -> Iterable[str]:
+        """
+        Return an iterator over text lines extracted in-process, page by page.
+
+        Raises:
+            ImportError: If PyPDF2 is not installed.
+        """
+        from PyPDF2 import PdfReader
+
+        def lines():
+            with open(path, 'rb') as file:
+                for page in PdfReader(file).pages:
+                    yield from page.extract_text().splitlines()
+
+        return lines()
+
+    @staticmethod
+    def _pdftotext_lines(path: str) -> Iterator[str]:
+        """Yield text lines streamed from a pdftotext subprocess's stdout."""
+        # stderr goes to a file: an unread pipe could fill up and block pdftotext
+        # while we wait on stdout.
+        with tempfile.TemporaryFile(mode='w+', encoding='utf-8') as errors:
+            with subprocess.Popen(['pdftotext', path, '-'], stdout=subprocess.PIPE,
+                                  stderr=errors, encoding='utf-8') as process:
+                yield from process.stdout
+            if process.returncode:
+                errors.seek(0)
+                raise subprocess.CalledProcessError(process.returncode, process.args,
+                                                    stderr=errors.read())
@@ -4,6 +4,8 @@
 class QuoteModel:
     """A simple class to encapsulate a quote with its body and author."""
 
+    __slots__ = ('body', 'author')
+
     def __init__(self, body: str, author: str):
         """
         Initialize a QuoteModel instance.
@@ -0,0 +1,273 @@
+"""
+quote_store module.
+
+This module provides the QuoteStore class, a compact container for large quote
+corpora. Bodies are kept as one UTF-8 buffer with an offsets array and authors
+are interned into a table referenced by index, so each quote costs a few bytes
+of overhead instead of a full Python object. QuoteModel instances are created
+only when a quote is read.
+"""
+
+import random
+from array import array
+from typing import Iterable, Iterator, List
+from .QuoteModel import QuoteModel
+
+
+class QuoteStore:
+    """An append-only, array-backed sequence of quotes with O(1) sampling."""
+
+    def __init__(self, quotes: Iterable[QuoteModel] = ()):
+        """
+        Initialize the store, optionally filling it with quotes.
+
+        Args:
+            quotes (Iterable[QuoteModel], optional): Initial quotes.
+        """
+        self._blob = bytearray()
+        self._offsets = array('Q', [0])
+        self._author_ids = array('I')
+        self._authors: List[str] = []
+        self._author_lookup = {}
+        self._by_author = None
+        self._alias = None
+        self.read_only = False
+        self.extend(quotes)
+
+    @classmethod
+    def from_buffers(cls, offsets, author_ids, blob, authors: List[str]) -> 'QuoteStore':
+        """
+        Build a read-only store over existing buffers without copying them.
+
+        Used to share one corpus between processes through a memory-mapped file.
+
+        Args:
+            offsets: Buffer of native uint64 body end offsets, starting with 0.
+            author_ids: Buffer of native uint32 author indices, one per quote.
+            blob: Buffer holding every body as concatenated UTF-8.
+            authors (List[str]): The author table.
+
+        Returns:
+            QuoteStore: A store that raises ValueError on add.
+        """
+        store = cls()
+        store._offsets = memoryview(offsets).cast('B').cast('Q')
+        store._author_ids = memoryview(author_ids).cast('B').cast('I')
+        store._blob = memoryview(blob).cast('B')
+        store._authors = list(authors)
+        store._author_lookup = {name: i for i, name in enumerate(store._authors)}
+        store.read_only = True
+        return store
+
+    def buffers(self) -> tuple:
+        """
+        Return the raw storage, the inverse of from_buffers.
+
+        Returns:
+            tuple: (offsets, author_ids, blob) as bytes-like objects, and the
+            author table.
+        """
+        return (memoryview(self._offsets).cast('B'), memoryview(self._author_ids).cast('B'),
+                memoryview(self._blob).cast('B'), list(self._authors))
+
+    def add(self, body: str, author: str):
+        """
+        Append a quote.
+
+        Args:
+            body (str): The text of the quote.
+            author (str): The quote's author.
+
+        Raises:
+            ValueError: If the store is read-only.
+        """
+        if self.read_only:
+            raise ValueError('QuoteStore is read-only')
+        author_id = self._author_lookup.get(author)
+        if author_id is None:
+            author_id = len(self._authors)
+            self._authors.append(author)
+            self._author_lookup[author] = author_id
+        self._blob += body.encode('utf-8')
+        self._offsets.append(len(self._blob))
+        self._author_ids.append(author_id)
+        self._by_author = None
+        self._alias = None
+
+    def extend(self, quotes: Iterable[QuoteModel]):
+        """
+        Append every quote from an iterable, e.g. Ingestor.iter_parse(path).
+
+        Args:
+            quotes (Iterable[QuoteModel]): Quotes to add.
+        """
+        for quote in quotes:
+            self.add(quote.body, quote.author)
+
+    def __len__(self) -> int:
+        """Return the number of quotes."""
+        return len(self._author_ids)
+
+    def body(self, index: int) -> str:
+        """
+        Return the body of the quote at index.
+
+        Args:
+            index (int): Position of the quote.
+
+        Returns:
+            str: The quote text.
+        """
+        if index < 0:
+            index += len(self)
+        return str(self._blob[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+
+    def author(self, index: int) -> str:
+        """
+        Return the author of the quote at index.
+
+        Args:
+            index (int): Position of the quote.
+
+        Returns:
+            str: The quote's author.
+        """
+        return self._authors[self._author_ids[index]]
+
+    def __getitem__(self, index: int) -> QuoteModel:
+        """
+        Return the quote at index as a QuoteModel.
+
+        Raises:
+            IndexError: If index is out of range.
+        """
+        if not -len(self) <= index < len(self):
+            raise IndexError('QuoteStore index out of range')
+        return QuoteModel(self.body(index), self.author(index))
+
+    def __iter__(self) -> Iterator[QuoteModel]:
+        """Yield every quote in insertion order."""
+        for index in range(len(self)):
+            yield self[index]
+
+    def authors(self) -> List[str]:
+        """
+        Return every distinct author, in order of first appearance.
+
+        Returns:
+            List[str]: Author names.
+        """
+        return list(self._authors)
+
+    def indices_for(self, author: str) -> array:
+        """
+        Return the positions of every quote by author.
+
+        The per-author index is built on first use and reused until the store
+        changes.
+
+        Args:
+            author (str): The author to filter by.
+
+        Returns:
+            array: Quote indices, in insertion order (empty if unknown).
+        """
+        if self._by_author is None:
+            by_author = [array('I') for _ in self._authors]
+            for index, author_id in enumerate(self._author_ids):
+                by_author[author_id].append(index)
+            self._by_author = by_author
+        author_id = self._author_lookup.get(author)
+        if author_id is None:
+            return array('I')
+        return self._by_author[author_id]
+
+    def by_author(self, author: str) -> List[QuoteModel]:
+        """
+        Return every quote by author.
+
+        Args:
+            author (str): The author to filter by.
+
+        Returns:
+            List[QuoteModel]: Matching quotes.
+        """
+        return [self[index] for index in self.indices_for(author)]
+
+    def choice(self, author: str = None, rng=random) -> QuoteModel:
+        """
+        Return a uniformly random quote in O(1).
+
+        Args:
+            author (str, optional): Only sample quotes by this author.
+            rng (random.Random, optional): Source of randomness.
+
+        Returns:
+            QuoteModel: The sampled quote.
+
+        Raises:
+            IndexError: If there is nothing to sample from.
+        """
+        if author is not None:
+            indices = self.indices_for(author)
+            if not indices:
+                raise IndexError(f'No quotes by {author}')
+            return self[indices[rng.randrange(len(indices))]]
+        if not len(self):
+            raise IndexError('Cannot choose from an empty QuoteStore')
+        return self[rng.randrange(len(self))]
+
+    def set_weights(self, weights: Iterable[float]):
+        """
+        Set per-quote sampling weights for weighted_choice.
+
+        Builds Walker/Vose alias tables in O(n), after which each weighted draw
+        is O(1).
+
+        Args:
+            weights (Iterable[float]): One non-negative weight per quote.
+
+        Raises:
+            ValueError: If the number of weights is wrong or they sum to zero.
+        """
+        weights = array('d', weights)
+        n = len(weights)
+        if n != len(self):
+            raise ValueError(f'Expected {len(self)} weights, got {n}')
+        total = sum(weights)
+        if total <= 0 or min(weights, default=0) < 0:
+            raise ValueError('Weights must be non-negative and not all zero')
+
+        prob = array('d', (w * n / total for w in weights))
+        alias = array('I', [0]) * n
+        small = [i for i, p in enumerate(prob) if p < 1.0]
+        large = [i for i, p in enumerate(prob) if p >= 1.0]
+        while small and large:
+            s, g = small.pop(), large.pop()
+            alias[s] = g
+            prob[g] -= 1.0 - prob[s]
+            (small if prob[g] < 1.0 else large).append(g)
+        for i in small + large:
+            prob[i] = 1.0
+        self._alias = (prob, alias)
+
+    def weighted_choice(self, rng=random) -> QuoteModel:
+        """
+        Return a random quote drawn according to set_weights, in O(1).
+
+        Args:
+            rng (random.Random, optional): Source of randomness.
+
+        Returns:
+            QuoteModel: The sampled quote.
+
+        Raises:
+            ValueError: If set_weights has not been called since the last change.
+        """
+        if self._alias is None:
+            raise ValueError('Call set_weights before weighted_choice')
+        prob, alias = self._alias
+        index = rng.randrange(len(prob))
+        if rng.random() >= prob[index]:
+            index = alias[index]
+        return self[index]
@@ -0,0 +1,223 @@
+"""
+shared_corpus module.
+
+This module provides the SharedCorpus class, which stores a QuoteStore and the
+photo index in a single file that web workers memory-map read-only. The pages
+are shared through the OS page cache, so the corpus is built once and every
+additional worker adds almost no private memory.
+
+File layout: an 8-byte magic, a little-endian uint32 header length, a JSON
+header (byte order, fingerprint and section lengths) padded to 8 bytes, then
+the quote offsets, author ids and body blob, the author offsets and blob, and
+the image path offsets and blob, each padded to 8 bytes. Offsets are native
+uint64 end positions starting with 0, as in QuoteStore.
+"""
+
+import fcntl
+import json
+import mmap
+import os
+import secrets
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Callable, Iterable, List
+from .QuoteStore import QuoteStore
+
+MAGIC = b'MEMECRP2'
+_ALIGN = 8
+
+
+def _pad(length: int) -> int:
+    """Return the padding needed to align length to _ALIGN bytes."""
+    return -length % _ALIGN
+
+
+class StringTable(Sequence):
+    """A read-only sequence of strings over an offsets buffer and a UTF-8 blob."""
+
+    def __init__(self, offsets, blob):
+        """
+        Wrap existing buffers without copying them.
+
+        Args:
+            offsets: Buffer of native uint64 end offsets, starting with 0.
+            blob: Buffer holding every string as concatenated UTF-8.
+        """
+        self._offsets = memoryview(offsets).cast('B').cast('Q')
+        self._blob = memoryview(blob).cast('B')
+
+    @staticmethod
+    def pack(strings: Iterable[str]) -> tuple:
+        """
+        Encode strings into the buffers StringTable reads.
+
+        Args:
+            strings (Iterable[str]): The strings, in order.
+
+        Returns:
+            tuple: (offsets, blob) as bytes.
+        """
+        offsets = array('Q', [0])
+        blob = bytearray()
+        for string in strings:
+            blob += string.encode('utf-8')
+            offsets.append(len(blob))
+        return offsets.tobytes(), bytes(blob)
+
+    def __len__(self) -> int:
+        """Return the number of strings."""
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        """Decode the string at index; slices return a list."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('StringTable index out of range')
+        return str(self._blob[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+
+
+class SharedCorpus:
+    """A quote corpus and image list attached from a memory-mapped file."""
+
+    def __init__(self, quotes: QuoteStore, images: List[str], fingerprint, mapping=None):
+        """
+        Initialize the corpus.
+
+        Args:
+            quotes (QuoteStore): The quotes, usually backed by mapping.
+            images (Sequence[str]): Paths of the meme photos; a StringTable
+                over mapping when attached.
+            fingerprint: The source fingerprint recorded when the file was built.
+            mapping (mmap.mmap, optional): The mapping backing quotes.
+        """
+        self.quotes = quotes
+        self.images = images
+        self.fingerprint = fingerprint
+        self._mapping = mapping
+
+    @staticmethod
+    def write(path: str, quotes: QuoteStore, images: List[str], fingerprint=None):
+        """
+        Write quotes and images to path atomically.
+
+        Args:
+            path (str): Destination file.
+            quotes (QuoteStore): The quotes to share.
+            images (List[str]): Paths of the meme photos.
+            fingerprint (optional): JSON-serializable description of the sources,
+                compared by attach_or_build to detect stale files.
+        """
+        offsets, author_ids, blob, authors = quotes.buffers()
+        sections = [offsets, author_ids, blob]
+        sections.extend(StringTable.pack(authors))
+        sections.extend(StringTable.pack(images))
+        header = json.dumps({
+            'byteorder': sys.byteorder,
+            'fingerprint': fingerprint,
+            'sections': [len(section) for section in sections],
+        }, ensure_ascii=False).encode('utf-8')
+        header += b' ' * _pad(len(MAGIC) + 4 + len(header))
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{path}.{secrets.token_hex(4)}.part'
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<I', len(header)))
+            f.write(header)
+            for section in sections:
+                f.write(section)
+                f.write(b'\0' * _pad(len(section)))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def attach(cls, path: str) -> 'SharedCorpus':
+        """
+        Map path read-only and expose its contents without copying them.
+
+        Only the author table is decoded into a list, which QuoteStore needs
+        for lookups; quote bodies and image paths are read from the mapping.
+
+        Args:
+            path (str): A file produced by write.
+
+        Returns:
+            SharedCorpus: The attached corpus.
+
+        Raises:
+            ValueError: If the file is not a compatible corpus file.
+        """
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapping[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a shared corpus file: {path}")
+        (header_len,) = struct.unpack_from('<I', mapping, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(mapping[start:start + header_len]).decode('utf-8'))
+        if header['byteorder'] != sys.byteorder:
+            raise ValueError(f"Shared corpus {path} was built for another byte order")
+
+        view = memoryview(mapping)
+        position = start + header_len
+        sections = []
+        for length in header['sections']:
+            sections.append(view[position:position + length])
+            position += length + _pad(length)
+        offsets, author_ids, blob = sections[:3]
+        quotes = QuoteStore.from_buffers(offsets, author_ids, blob, StringTable(*sections[3:5]))
+        images = StringTable(*sections[5:])
+        return cls(quotes, images, header['fingerprint'], mapping)
+
+    @classmethod
+    def attach_or_build(cls, path: str, fingerprint, build: Callable) -> 'SharedCorpus':
+        """
+        Attach to path, rebuilding it first if missing or stale.
+
+        An exclusive lock on a sidecar file ensures only one process builds
+        while the others wait and then attach to the result.
+
+        Args:
+            path (str): The shared corpus file.
+            fingerprint: JSON-serializable description of the current sources.
+            build (Callable): Returns (QuoteStore, list of image paths).
+
+        Returns:
+            SharedCorpus: The attached corpus.
+        """
+        fingerprint = json.loads(json.dumps(fingerprint))
+        corpus = cls._try_attach(path, fingerprint)
+        if corpus is not None:
+            return corpus
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(f'{path}.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                corpus = cls._try_attach(path, fingerprint)
+                if corpus is None:
+                    quotes, images = build()
+                    cls.write(path, quotes, images, fingerprint)
+                    corpus = cls.attach(path)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+        return corpus
+
+    @classmethod
+    def _try_attach(cls, path: str, fingerprint):
+        """Return the attached corpus if path exists and matches fingerprint."""
+        try:
+            corpus = cls.attach(path)
+        except (OSError, ValueError, KeyError, struct.error):
+            # Missing, truncated or from an older layout: rebuild it.
+            return None
+        if corpus.fingerprint != fingerprint:
+            return None
+        return corpus
@@ -0,0 +1,59 @@
+"""
+text_ingestor module.
+
+This module provides functionality to parse plain text files where each
+line holds a quote in the form 'body - author'.
+"""
+
+from typing import Iterator, List
+from .IngestorInterface import IngestorInterface
+from .QuoteModel import QuoteModel
+
+
+class TextIngestor(IngestorInterface):
+    """A concrete ingestor class to parse TXT files containing quotes."""
+
+    allowed_extensions = ['txt']
+
+    @classmethod
+    def can_ingest(cls, path: str) -> bool:
+        """
+        Check if the file extension is '.txt'.
+
+        Args:
+            path (str): The file path.
+
+        Returns:
+            bool: True if the file is a TXT, False otherwise.
+        """
+        return path.lower().endswith('.txt')
+
+    @classmethod
+    def parse(cls, path: str) -> List[QuoteModel]:
+        """
+        Parse a TXT file and return a list of QuoteModel instances.
+
+        Args:
+            path (str): The path to the TXT file.
+
+        Returns:
+            List[QuoteModel]: List of QuoteModel objects parsed from the file.
+        """
+        return list(cls.iter_parse(path))
+
+    @classmethod
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Stream a TXT file, yielding one QuoteModel per matching line.
+
+        Args:
+            path (str): The path to the TXT file.
+
+        Yields:
+            QuoteModel: One quote per 'body - author' line.
+        """
+        with open(path, 'r', encoding='utf-8-sig') as file:
+            for line in file:
+                quote = cls.parse_line(line, path)
+                if quote is not None:
+                    yield quote
@@ -7,49 +7,313 @@ custom memes from a quote and an image URL.
 
 import random
 import os
-import requests
-from flask import Flask, render_template, request
+import logging
+import time
+from functools import partial
+from flask import Flask, Response, g, jsonify, make_response, render_template, request
 
+from MemeEngine.FetchCache import FetchCache
+from MemeEngine.ImageCatalog import ImageCatalog
+from MemeEngine.ImageFetcher import FetchError, ImageFetcher
 from MemeEngine.MemeEngine import MemeEngine
-from QuoteEngine.Ingestor import Ingestor
+from MemeEngine.MemePool import MemePool
+from MemeEngine.RenderExecutor import RenderExecutor, RenderQueueFull, RenderTimeout
+from Metrics.Metrics import registry
+from Metrics.Profiler import Profiler
+from QuoteEngine.CorpusReloader import CorpusReloader
+from QuoteEngine.CorpusSnapshot import CorpusSnapshot
+from QuoteEngine.QuoteStore import QuoteStore
+from QuoteEngine.SharedCorpus import SharedCorpus
+
+STATIC_MAX_FILES = int(os.environ.get('MEME_STATIC_MAX_FILES', 1000))
+CORPUS_SNAPSHOT = os.environ.get('MEME_CORPUS_SNAPSHOT', './.cache/quote_corpus.json')
+PHOTO_CATALOG = os.environ.get('MEME_PHOTO_CATALOG', './.cache/photo_catalog.json')
+SHARED_CORPUS = os.environ.get('MEME_SHARED_CORPUS')
+RELOAD_INTERVAL = float(os.environ.get('MEME_RELOAD_INTERVAL', 0))
+POOL_SIZE = int(os.environ.get('MEME_POOL_SIZE', 8))
+POOL_WORKERS = int(os.environ.get('MEME_POOL_WORKERS', 1))
+POOL_MAX_AGE = float(os.environ.get('MEME_POOL_MAX_AGE', 300))
+RENDER_WORKERS = os.environ.get('MEME_RENDER_WORKERS')
+RENDER_QUEUE = os.environ.get('MEME_RENDER_QUEUE')
+RENDER_TIMEOUT = float(os.environ.get('MEME_RENDER_TIMEOUT', 10))
+OUTPUT_PRESETS = os.environ.get('MEME_OUTPUT_PRESETS', 'webp,jpeg-progressive').split(',')
+FETCH_MAX_BYTES = int(os.environ.get('MEME_FETCH_MAX_BYTES', 10 * 1024 * 1024))
+FETCH_CACHE_DIR = os.environ.get('MEME_FETCH_CACHE_DIR', './.cache/fetch')
+FETCH_CACHE_BYTES = int(os.environ.get('MEME_FETCH_CACHE_BYTES', 256 * 1024 * 1024))
+PROFILE_RATE = float(os.environ.get('MEME_PROFILE_RATE', 0))
+PROFILE_DIR = os.environ.get('MEME_PROFILE_DIR', './.cache/profiles')
+
+logger = logging.getLogger(__name__)
+
+REQUEST_SECONDS = registry.histogram(
+    'http_request_seconds', 'Seconds spent handling a request, by endpoint.', ('endpoint',)
+)
+RESPONSES = registry.counter(
+    'http_responses_total', 'Responses sent, by endpoint and status code.',
+    ('endpoint', 'status')
+)
+RENDER_IN_FLIGHT = registry.gauge(
+    'meme_render_in_flight', 'Renders running or waiting for a worker.'
+)
+RENDER_QUEUED = registry.gauge(
+    'meme_render_queued', 'Renders waiting for a worker.'
+)
+POOL_DEPTH = registry.gauge(
+    'meme_pool_depth', 'Pre-rendered memes ready to serve, by output preset.', ('preset',)
+)
 
 app = Flask(__name__)
-meme = MemeEngine('./static')
+profiler = Profiler(PROFILE_RATE, PROFILE_DIR)
+meme = MemeEngine(
+    './static',
+    deterministic=os.environ.get('MEME_DETERMINISTIC', '0') == '1',
+    max_files=STATIC_MAX_FILES
+)
+# One engine per output encoding this Pillow build supports, most preferred first.
+engines = {
+    preset: meme.with_preset(preset)
+    for preset in OUTPUT_PRESETS if preset in MemeEngine.supported_presets()
+} or {'jpeg': meme}
+# Presets offered through Accept negotiation, most preferred first.
+negotiable = list(engines)
+# The .jpg routes always answer with JPEG, whatever the client accepts: the
+# first configured JPEG preset, or Pillow's defaults if none is configured.
+JPEG_PRESET = next((preset for preset in negotiable
+                    if engines[preset].output_format == 'JPEG'), 'jpeg')
+engines.setdefault(JPEG_PRESET, meme.with_preset(JPEG_PRESET))
+renderer = RenderExecutor(
+    meme,
+    workers=int(RENDER_WORKERS) if RENDER_WORKERS else None,
+    max_queue=int(RENDER_QUEUE) if RENDER_QUEUE else None,
+    timeout=RENDER_TIMEOUT,
+    profiler=profiler
+)
+fetcher = ImageFetcher(
+    max_bytes=FETCH_MAX_BYTES,
+    cache=FetchCache(FETCH_CACHE_DIR, FETCH_CACHE_BYTES) if FETCH_CACHE_BYTES else None
+)
 
 
-def setup():
+QUOTE_FILES = [
+    './_data/DogQuotes/DogQuotesTXT.txt',
+    './_data/DogQuotes/DogQuotesDOCX.docx',
+    './_data/DogQuotes/DogQuotesPDF.pdf',
+    './_data/DogQuotes/DogQuotesCSV.csv'
+]
+IMAGES_PATH = "./_data/photos/dog/"
+catalog = ImageCatalog(PHOTO_CATALOG, [IMAGES_PATH])
+
+
+def load_sources():
     """
     Load all quotes and image paths from disk.
 
     Returns:
-        tuple: A list of QuoteModel instances and a list of image paths.
+        tuple: A QuoteStore of all quotes and a list of image paths.
+    """
+    report = CorpusSnapshot(CORPUS_SNAPSHOT).load(QUOTE_FILES)
+    for file, error in report.errors.items():
+        logger.warning("Error parsing %s: %s", file, error)
+    quotes = QuoteStore(report.quotes)
+
+    catalog.scan()
+    return quotes, catalog.images()
+
+
+def source_fingerprint():
     """
-    quote_files = [
-        './_data/DogQuotes/DogQuotesTXT.txt',
-        './_data/DogQuotes/DogQuotesDOCX.docx',
-        './_data/DogQuotes/DogQuotesPDF.pdf',
-        './_data/DogQuotes/DogQuotesCSV.csv'
-    ]
+    Describe the quote files and photo directories by size and mtime.
+
+    The photo directories are those the persisted catalog already knows (plus
+    its roots), each stat()ed once; nothing is listed or probed here. A new
+    subdirectory changes its parent's mtime, and the catalog scan in
+    load_sources() runs once under the shared corpus lock.
 
-    quotes = []
-    for file in quote_files:
+    Returns:
+        list: One [path, size, mtime] entry per source; missing files have None.
+    """
+    paths = list(QUOTE_FILES)
+    paths.extend(dict.fromkeys([*catalog.roots, *catalog.directories()]))
+    fingerprint = []
+    for path in paths:
         try:
-            quotes.extend(Ingestor.parse(file))
-        except Exception as e:
-            print(f"Error parsing {file}: {e}")
-
-    images_path = "./_data/photos/dog/"
-    imgs = []
-    for root, _, files in os.walk(images_path):
-        imgs.extend([
-            os.path.join(root, name)
-            for name in files if name.lower().endswith(('jpg', 'jpeg', 'png'))
-        ])
+            st = os.stat(path)
+            fingerprint.append([path, st.st_size, st.st_mtime_ns])
+        except OSError:
+            fingerprint.append([path, None, None])
+    return fingerprint
+
+
+def setup():
+    """
+    Load all quotes and image paths.
+
+    With MEME_SHARED_CORPUS set, the corpus is built once into that file and
+    every worker memory-maps it read-only instead of holding its own copy.
 
+    Returns:
+        tuple: A QuoteStore of all quotes and a list of image paths.
+    """
+    if SHARED_CORPUS:
+        corpus = SharedCorpus.attach_or_build(SHARED_CORPUS, source_fingerprint(),
+                                              load_sources)
+        return corpus.quotes, corpus.images
+    return load_sources()
+
+
+reloader = None
+if RELOAD_INTERVAL > 0 and not SHARED_CORPUS:
+    # Polling starts on the first request, like the pre-render pool, so that
+    # the thread runs in each worker process rather than in a pre-fork master.
+    reloader = CorpusReloader(QUOTE_FILES, catalog, interval=RELOAD_INTERVAL,
+                              snapshot=CorpusSnapshot(CORPUS_SNAPSHOT))
+    quotes, imgs = reloader.current()
+else:
+    quotes, imgs = setup()
+
+
+def corpus():
+    """
+    Return the quotes and images to serve.
+
+    With MEME_RELOAD_INTERVAL set, this is the latest version picked up by the
+    background reloader, which the first call starts.
+
+    Returns:
+        tuple: A QuoteStore of all quotes and a list of image paths.
+    """
+    if reloader is not None:
+        reloader.start()
+        return reloader.current()
     return quotes, imgs
 
 
-quotes, imgs = setup()
+def preferred_preset(accept_mimetypes) -> str:
+    """
+    Choose the output preset for a request from its Accept header.
+
+    Args:
+        accept_mimetypes (MIMEAccept): The parsed Accept header.
+
+    Returns:
+        str: A key of engines.
+    """
+    accepted = (mimetype for mimetype, quality in accept_mimetypes if quality > 0)
+    return MemeEngine.negotiate_preset(accepted, negotiable)
+
+
+def image_preset(path: str, accept_mimetypes) -> str:
+    """
+    Choose the preset for an image route.
+
+    Args:
+        path (str): The request path; '.jpg' routes are pinned to JPEG.
+        accept_mimetypes (MIMEAccept): The parsed Accept header.
+
+    Returns:
+        str: JPEG_PRESET for '.jpg' paths, else the negotiated preset.
+    """
+    if path.endswith('.jpg'):
+        return JPEG_PRESET
+    return preferred_preset(accept_mimetypes)
+
+
+def render_random(preset: str, background: bool = False):
+    """
+    Render a meme from a random quote and image into ./static.
+
+    Args:
+        preset (str): Output encoding, a key of engines.
+        background (bool, optional): Pre-render at low priority, only while a
+            render worker is idle, so requests keep every queue slot.
+
+    Returns:
+        str: Path to the generated meme image.
+    """
+    quotes, imgs = corpus()
+    quote = quotes.choice()
+    img = random.choice(imgs)
+    return renderer.run('make_meme', img, quote.body, quote.author, engine=engines[preset],
+                        background=background)
+
+
+def busy_response() -> Response:
+    """
+    Build the 503 returned when the render executor is saturated or too slow.
+
+    Returns:
+        Response: A 503 with a Retry-After header.
+    """
+    response = Response("The server is busy, please try again shortly.", status=503)
+    response.headers['Retry-After'] = str(renderer.retry_after())
+    return response
+
+
+# Only the most preferred preset is pre-rendered: a pool per preset would run
+# a producer per preset against the same render workers. Clients that do not
+# accept it are rendered on demand.
+pools = {
+    preset: MemePool(partial(render_random, preset, background=True), size=POOL_SIZE,
+                     workers=POOL_WORKERS, max_age=POOL_MAX_AGE, is_valid=os.path.exists,
+                     name=preset)
+    for preset in negotiable[:1]
+}
+
+
+def pooled_meme(preset: str):
+    """
+    Take a pre-rendered meme in the given preset, if one is ready.
+
+    The pool is started lazily so producer threads exist in each forked worker.
+
+    Args:
+        preset (str): Output encoding, a key of engines.
+
+    Returns:
+        str: Path to the meme image, or None if it must be rendered now.
+    """
+    pool = pools.get(preset)
+    if pool is None:
+        return None
+    pool.start()
+    return pool.get()
+
+
+def page_response(path: str) -> Response:
+    """
+    Render the meme page; its image format depends on the Accept header.
+
+    Args:
+        path (str): Path of the meme image.
+
+    Returns:
+        Response: The HTML page, marked as varying by Accept.
+    """
+    response = make_response(render_template('meme.html', path=path))
+    response.vary.add('Accept')
+    return response
+
+
+@app.before_request
+def start_request():
+    """Start the request timer, and a cProfile sample if this request is picked."""
+    g.started = time.perf_counter()
+    g.profile = profiler.start()
+
+
+@app.after_request
+def record_request(response: Response) -> Response:
+    """Record the request's duration and status code."""
+    endpoint = request.endpoint or 'unmatched'
+    REQUEST_SECONDS.observe(time.perf_counter() - g.started, endpoint)
+    RESPONSES.inc(1, endpoint, response.status_code)
+    return response
+
+
+@app.teardown_request
+def stop_profile(error=None):
+    """Write the request's cProfile sample, if one was taken."""
+    profiler.stop(g.pop('profile', None), f'request-{request.endpoint or "unmatched"}')
 
 
 @app.route('/')
@@ -57,16 +321,22 @@ def meme_rand():
     """
     Generate a random meme using a random quote and image.
 
+    Serves a pre-rendered meme from the pool when one is ready, encoded in the
+    best format the client accepts.
+
     Returns:
-        str: Rendered HTML page with the generated meme.
+        Response: Rendered HTML page with the generated meme.
     """
+    quotes, imgs = corpus()
     if not quotes or not imgs:
         return "Quotes or images not found!", 500
 
-    quote = random.choice(quotes)
-    img = random.choice(imgs)
-    path = meme.make_meme(img, quote.body, quote.author)
-    return render_template('meme.html', path=path)
+    preset = preferred_preset(request.accept_mimetypes)
+    try:
+        path = pooled_meme(preset) or render_random(preset)
+    except (RenderQueueFull, RenderTimeout):
+        return busy_response()
+    return page_response(path)
 
 
 @app.route('/create', methods=['GET'])
@@ -86,7 +356,7 @@ def meme_post():
     Create a meme based on user-submitted quote and image URL.
 
     Returns:
-        str: Rendered HTML page with the generated meme.
+        Response: Rendered HTML page with the generated meme.
     """
     image_url = request.form.get('image_url')
     body = request.form.get('body')
@@ -96,23 +366,146 @@ def meme_post():
         return "All fields are required!", 400
 
     try:
-        response = requests.get(image_url)
-        if response.status_code != 200:
-            return "Unable to download image from URL", 400
+        engine = engines[preferred_preset(request.accept_mimetypes)]
+        path = renderer.run('make_meme', fetcher.fetch_source(image_url), body, author,
+                            engine=engine)
+
+    except (RenderQueueFull, RenderTimeout):
+        return busy_response()
+    except FetchError as e:
+        return str(e), 400
+    except Exception as e:
+        return f"Error creating meme: {e}", 500
+
+    return page_response(path)
+
+
+def image_response(data: bytes, preset: str) -> Response:
+    """
+    Wrap encoded meme bytes in an HTTP response.
+
+    Args:
+        data (bytes): The encoded image.
+        preset (str): The preset it was encoded with.
+
+    Returns:
+        Response: The image with Content-Type, Content-Length and Vary set.
+    """
+    response = Response(data, mimetype=engines[preset].mimetype)
+    response.headers['Content-Length'] = str(len(data))
+    response.vary.add('Accept')
+    return response
+
+
+@app.route('/meme.jpg')
+@app.route('/meme.img')
+def meme_rand_image():
+    """
+    Render a random meme in memory and return the image itself.
+
+    /meme.jpg is always JPEG; /meme.img is encoded in the best format the
+    client accepts.
+
+    Returns:
+        Response: The encoded meme image.
+    """
+    quotes, imgs = corpus()
+    if not quotes or not imgs:
+        return "Quotes or images not found!", 500
+
+    preset = image_preset(request.path, request.accept_mimetypes)
+    quote = quotes.choice()
+    img = random.choice(imgs)
+    try:
+        data = renderer.run('render', img, quote.body, quote.author, engine=engines[preset])
+    except (RenderQueueFull, RenderTimeout):
+        return busy_response()
+    return image_response(data, preset)
+
+
+@app.route('/create.jpg', methods=['POST'])
+@app.route('/create.img', methods=['POST'])
+def meme_post_image():
+    """
+    Render a user-defined meme in memory and return the image itself.
 
-        tmp_image_path = f"./tmp/{random.randint(0, 1000000)}.jpg"
-        os.makedirs(os.path.dirname(tmp_image_path), exist_ok=True)
+    /create.jpg is always JPEG; /create.img is encoded in the best format the
+    client accepts.
 
-        with open(tmp_image_path, 'wb') as f:
-            f.write(response.content)
+    Returns:
+        Response: The encoded meme image.
+    """
+    image_url = request.form.get('image_url')
+    body = request.form.get('body')
+    author = request.form.get('author')
+
+    if not image_url or not body or not author:
+        return "All fields are required!", 400
 
-        path = meme.make_meme(tmp_image_path, body, author)
-        os.remove(tmp_image_path)
+    try:
+        preset = image_preset(request.path, request.accept_mimetypes)
+        data = renderer.run('render', fetcher.fetch_source(image_url), body, author,
+                            engine=engines[preset])
 
+    except (RenderQueueFull, RenderTimeout):
+        return busy_response()
+    except FetchError as e:
+        return str(e), 400
     except Exception as e:
         return f"Error creating meme: {e}", 500
 
-    return render_template('meme.html', path=path)
+    return image_response(data, preset)
+
+
+def stats_data() -> dict:
+    """
+    Collect render queue depth and timings, and pre-render pool counters.
+
+    Returns:
+        dict: A 'render' section and a 'pool' section per pre-rendered preset.
+    """
+    return {'render': renderer.stats(),
+            'pool': {preset: pool.stats() for preset, pool in pools.items()}}
+
+
+@app.route('/stats')
+def stats():
+    """
+    Report render queue depth and timings, and pre-render pool counters.
+
+    Returns:
+        Response: The stats_data() sections as JSON.
+    """
+    return jsonify(stats_data())
+
+
+def metrics_text() -> str:
+    """
+    Render every metric of this process in the Prometheus text format.
+
+    Queue and pool gauges are sampled now; stage timings recorded in render
+    workers have already been merged in as their renders completed.
+
+    Returns:
+        str: The exposition.
+    """
+    render = renderer.stats()
+    RENDER_IN_FLIGHT.set(render['in_flight'])
+    RENDER_QUEUED.set(render['queued'])
+    for preset, pool in pools.items():
+        POOL_DEPTH.set(pool.stats()['depth'], preset)
+    return registry.render()
+
+
+@app.route('/metrics')
+def metrics():
+    """
+    Expose request, render-stage, parse and queue metrics for Prometheus.
+
+    Returns:
+        Response: The metrics in the Prometheus text format.
+    """
+    return Response(metrics_text(), mimetype='text/plain; version=0.0.4')
 
 
 if __name__ == "__main__":
@@ -0,0 +1,260 @@
+"""
+asgi_app.py.
+
+An asyncio (ASGI) version of the meme web app built with Quart. It serves the
+same routes and templates as app.py and shares its corpus, MemeEngine, render
+executor and pre-render pool, but downloads images with an async client, so
+one process can wait on many slow uploads while rendering continues in the
+process pool.
+
+Run it with an ASGI server, e.g.:
+    uvicorn asgi_app:app --port 5000
+
+hypercorn runs the app in a daemonic worker process, which cannot start the
+render process pool, so prefer uvicorn.
+"""
+
+import os
+import random
+from quart import Quart, Response, make_response, render_template, request
+
+from MemeEngine.AsyncImageFetcher import AsyncImageFetcher, FetchBusy
+from MemeEngine.ImageFetcher import FetchError
+from MemeEngine.RenderExecutor import RenderQueueFull, RenderTimeout
+from app import (FETCH_MAX_BYTES, corpus, engines, fetcher as sync_fetcher, image_preset,
+                 metrics_text, pooled_meme, preferred_preset, renderer, stats_data)
+
+FETCH_MAX_CONNECTIONS = int(os.environ.get('MEME_FETCH_MAX_CONNECTIONS', 100))
+
+app = Quart(__name__)
+fetcher = AsyncImageFetcher(
+    max_bytes=FETCH_MAX_BYTES,
+    max_connections=FETCH_MAX_CONNECTIONS,
+    cache=sync_fetcher.cache
+)
+
+
+class MissingFields(Exception):
+    """Raised when a submitted form lacks the image URL, body or author."""
+
+
+@app.after_serving
+async def close_fetcher():
+    """Close the pooled HTTP connections on shutdown."""
+    await fetcher.aclose()
+
+
+def busy_response() -> Response:
+    """
+    Build the 503 returned when the render executor or download pool is
+    saturated, or a render is too slow.
+
+    Returns:
+        Response: A 503 with a Retry-After header.
+    """
+    return Response("The server is busy, please try again shortly.", status=503,
+                    headers={'Retry-After': str(renderer.retry_after())})
+
+
+async def render_random(method: str, preset: str):
+    """
+    Render a meme from a random quote and image.
+
+    Args:
+        method (str): 'make_meme' to write into ./static or 'render' for bytes.
+        preset (str): Output encoding, a key of engines.
+
+    Returns:
+        str or bytes: The meme path or the encoded image.
+    """
+    quotes, imgs = corpus()
+    quote = quotes.choice()
+    img = random.choice(imgs)
+    return await renderer.arun(method, img, quote.body, quote.author,
+                               engine=engines[preset])
+
+
+async def render_posted(method: str, preset: str):
+    """
+    Fetch the submitted image URL and render the submitted quote onto it.
+
+    Args:
+        method (str): 'make_meme' to write into ./static or 'render' for bytes.
+        preset (str): Output encoding, a key of engines.
+
+    Returns:
+        str or bytes: The meme path or the encoded image.
+
+    Raises:
+        MissingFields: If a form field is missing.
+        FetchError: If the image cannot be downloaded or is not an image.
+        FetchBusy: If no download connection frees up in time.
+    """
+    form = await request.form
+    image_url = form.get('image_url')
+    body = form.get('body')
+    author = form.get('author')
+
+    if not image_url or not body or not author:
+        raise MissingFields("All fields are required!")
+
+    source = await fetcher.fetch_source(image_url)
+    return await renderer.arun(method, source, body, author, engine=engines[preset])
+
+
+async def page_response(path: str) -> Response:
+    """
+    Render the meme page; its image format depends on the Accept header.
+
+    Args:
+        path (str): Path of the meme image.
+
+    Returns:
+        Response: The HTML page, marked as varying by Accept.
+    """
+    response = await make_response(await render_template('meme.html', path=path))
+    response.vary.add('Accept')
+    return response
+
+
+@app.route('/')
+async def meme_rand():
+    """
+    Generate a random meme using a random quote and image.
+
+    Returns:
+        Response: Rendered HTML page with the generated meme.
+    """
+    quotes, imgs = corpus()
+    if not quotes or not imgs:
+        return "Quotes or images not found!", 500
+
+    preset = preferred_preset(request.accept_mimetypes)
+    try:
+        path = pooled_meme(preset) or await render_random('make_meme', preset)
+    except (RenderQueueFull, RenderTimeout):
+        return busy_response()
+    return await page_response(path)
+
+
+@app.route('/create', methods=['GET'])
+async def meme_form():
+    """
+    Display a form for user to input quote and image URL.
+
+    Returns:
+        str: Rendered HTML form for meme creation.
+    """
+    return await render_template('meme_form.html')
+
+
+@app.route('/create', methods=['POST'])
+async def meme_post():
+    """
+    Create a meme based on user-submitted quote and image URL.
+
+    Returns:
+        Response: Rendered HTML page with the generated meme.
+    """
+    try:
+        path = await render_posted('make_meme', preferred_preset(request.accept_mimetypes))
+
+    except (RenderQueueFull, RenderTimeout, FetchBusy):
+        return busy_response()
+    except (MissingFields, FetchError) as e:
+        return str(e), 400
+    except Exception as e:
+        return f"Error creating meme: {e}", 500
+
+    return await page_response(path)
+
+
+def image_response(data: bytes, preset: str) -> Response:
+    """
+    Wrap encoded meme bytes in an HTTP response.
+
+    Args:
+        data (bytes): The encoded image.
+        preset (str): The preset it was encoded with.
+
+    Returns:
+        Response: The image with Content-Type and Vary set.
+    """
+    response = Response(data, mimetype=engines[preset].mimetype)
+    response.vary.add('Accept')
+    return response
+
+
+@app.route('/meme.jpg')
+@app.route('/meme.img')
+async def meme_rand_image():
+    """
+    Render a random meme in memory and return the image itself.
+
+    /meme.jpg is always JPEG; /meme.img is encoded in the best format the
+    client accepts.
+
+    Returns:
+        Response: The encoded meme image.
+    """
+    quotes, imgs = corpus()
+    if not quotes or not imgs:
+        return "Quotes or images not found!", 500
+
+    preset = image_preset(request.path, request.accept_mimetypes)
+    try:
+        return image_response(await render_random('render', preset), preset)
+    except (RenderQueueFull, RenderTimeout):
+        return busy_response()
+
+
+@app.route('/create.jpg', methods=['POST'])
+@app.route('/create.img', methods=['POST'])
+async def meme_post_image():
+    """
+    Render a user-defined meme in memory and return the image itself.
+
+    /create.jpg is always JPEG; /create.img is encoded in the best format the
+    client accepts.
+
+    Returns:
+        Response: The encoded meme image.
+    """
+    preset = image_preset(request.path, request.accept_mimetypes)
+    try:
+        data = await render_posted('render', preset)
+
+    except (RenderQueueFull, RenderTimeout, FetchBusy):
+        return busy_response()
+    except (MissingFields, FetchError) as e:
+        return str(e), 400
+    except Exception as e:
+        return f"Error creating meme: {e}", 500
+
+    return image_response(data, preset)
+
+
+@app.route('/stats')
+async def stats():
+    """
+    Report render queue depth and timings, and pre-render pool counters.
+
+    Returns:
+        dict: The stats_data() sections, sent as JSON.
+    """
+    return stats_data()
+
+
+@app.route('/metrics')
+async def metrics():
+    """
+    Expose render-stage, fetch, parse and queue metrics for Prometheus.
+
+    Returns:
+        Response: The metrics in the Prometheus text format.
+    """
+    return Response(metrics_text(), mimetype='text/plain; version=0.0.4')
+
+
+if __name__ == "__main__":
+    app.run()
@@ -0,0 +1,6 @@
+"""
+Benchmarks for the meme generator.
+
+Each module is a standalone script run from the repository root, e.g.
+``python -m benchmarks.import_time``; pass ``--json`` for machine-readable output.
+"""
@@ -0,0 +1,99 @@
+"""
+compare benchmark helper.
+
+Diffs two result files written by benchmarks.suite and flags every metric
+that got worse by more than a threshold. Results are matched by their
+non-metric fields (format and size, megapixels and text, preset, server and
+endpoint, ...), so runs at different scales compare the cases they share.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 0.1]
+"""
+
+import argparse
+import json
+import sys
+
+# Metric name to True if higher is better.
+METRICS = {
+    'seconds': False,
+    'ms_per_meme': False,
+    'ms_per_image': False,
+    'bytes_per_image': False,
+    'maxrss_kib': False,
+    'p50_seconds': False,
+    'p95_seconds': False,
+    'quotes_per_sec': True,
+    'requests_per_sec': True,
+}
+
+# Measured fields that are not compared.
+IGNORED = {'quotes', 'file_bytes', 'bytes_vs_jpeg'}
+
+
+def case_key(result: dict) -> tuple:
+    """Return the fields that identify a result, excluding its measurements."""
+    return tuple(sorted((name, value) for name, value in result.items()
+                        if name not in METRICS and name not in IGNORED
+                        and isinstance(value, (str, int, float, bool))))
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> list:
+    """
+    Compare every metric the two runs have in common.
+
+    Args:
+        baseline (dict): Earlier suite results.
+        candidate (dict): Later suite results.
+        threshold (float): Relative change counted as a regression, e.g. 0.1.
+
+    Returns:
+        list: (benchmark, case, metric, old, new, change, regressed) tuples,
+        where change is the relative change and positive means worse.
+    """
+    rows = []
+    for name, results in candidate['benchmarks'].items():
+        previous = {case_key(r): r for r in baseline['benchmarks'].get(name, [])}
+        for result in results:
+            old_result = previous.get(case_key(result))
+            if old_result is None:
+                continue
+            case = ' '.join(f'{k}={v}' for k, v in case_key(result))
+            for metric, higher_is_better in METRICS.items():
+                old, new = old_result.get(metric), result.get(metric)
+                if not old or new is None:
+                    continue
+                change = (new - old) / old
+                if higher_is_better:
+                    change = -change
+                rows.append((name, case, metric, old, new, change, change > threshold))
+    return rows
+
+
+def main():
+    """Parse arguments, print the comparison and exit 1 on any regression."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('baseline', help="Earlier suite results")
+    parser.add_argument('candidate', help="Later suite results")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="Relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding='utf-8') as f:
+        candidate = json.load(f)
+
+    rows = compare(baseline, candidate, args.threshold)
+    print(f"baseline  {baseline.get('commit')} ({baseline.get('timestamp')})")
+    print(f"candidate {candidate.get('commit')} ({candidate.get('timestamp')})")
+    for name, case, metric, old, new, change, regressed in rows:
+        flag = 'REGRESSION' if regressed else ''
+        print(f"{name:<10}{case:<45}{metric:<18}{old:>12.4g}{new:>12.4g}"
+              f"{change:>+9.1%}  {flag}")
+    if any(row[-1] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+corpora benchmark helper.
+
+Writes synthetic corpora of N quotes as TXT, CSV, DOCX or PDF in the layouts
+the QuoteEngine ingestors expect. The PDF writer emits a minimal uncompressed PDF directly,
+so no PDF authoring library is needed.
+
+Usage:
+    python -m benchmarks.corpora --format pdf --quotes 100000 --out quotes.pdf
+"""
+
+import argparse
+import csv
+
+FORMATS = ('txt', 'csv', 'docx', 'pdf')
+
+LINES_PER_PDF_PAGE = 60
+
+
+def quotes(count: int):
+    """
+    Yield count deterministic (body, author) pairs.
+
+    Args:
+        count (int): Number of quotes.
+
+    Yields:
+        tuple: The body and author of each quote.
+    """
+    for i in range(count):
+        yield f'Quote number {i}, said with feeling', f'Author {i % 5000}'
+
+
+def write_txt(path: str, count: int):
+    """Write count quotes as 'body - author' lines."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for body, author in quotes(count):
+            f.write(f'{body} - {author}\n')
+
+
+def write_csv(path: str, count: int):
+    """Write count quotes as a body,author CSV with a header row."""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['body', 'author'])
+        writer.writerows(quotes(count))
+
+
+def write_docx(path: str, count: int):
+    """Write count quotes as one '"body" - author' paragraph each."""
+    import docx
+
+    document = docx.Document()
+    for body, author in quotes(count):
+        document.add_paragraph(f'"{body}" - {author}')
+    document.save(path)
+
+
+def _pdf_escape(text: str) -> str:
+    """Escape text for a PDF literal string."""
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path: str, count: int):
+    """
+    Write count quotes as 'body - author' lines, LINES_PER_PDF_PAGE per page.
+
+    Objects are streamed to disk as they are generated; the page tree is
+    written last, so memory stays flat however large the corpus.
+    """
+    offsets = {}
+    page_ids = []
+
+    with open(path, 'wb') as f:
+        def write_object(number: int, body: bytes):
+            offsets[number] = f.tell()
+            f.write(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+
+        f.write(b'%PDF-1.4\n')
+        write_object(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+        write_object(3, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+
+        next_id = 4
+        pairs = quotes(count)
+        while True:
+            lines = [f'{body} - {author}' for body, author in
+                     (pair for _, pair in zip(range(LINES_PER_PDF_PAGE), pairs))]
+            if not lines and page_ids:
+                break
+            text = ''.join(f'({_pdf_escape(line)}) Tj T*\n' for line in lines)
+            stream = f'BT /F1 10 Tf 12 TL 36 806 Td\n{text}ET'.encode('latin-1')
+            write_object(next_id, b'<< /Length %d >>\nstream\n' % len(stream) +
+                         stream + b'\nendstream')
+            write_object(next_id + 1,
+                         b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+                         b'/Resources << /Font << /F1 3 0 R >> >> '
+                         b'/Contents %d 0 R >>' % next_id)
+            page_ids.append(next_id + 1)
+            next_id += 2
+            if len(lines) < LINES_PER_PDF_PAGE:
+                break
+
+        kids = b' '.join(b'%d 0 R' % page for page in page_ids)
+        write_object(2, b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(page_ids)))
+
+        xref = f.tell()
+        f.write(b'xref\n0 %d\n0000000000 65535 f \n' % next_id)
+        for number in range(1, next_id):
+            f.write(b'%010d 00000 n \n' % offsets[number])
+        f.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+                % (next_id, xref))
+
+
+WRITERS = {'txt': write_txt, 'csv': write_csv, 'docx': write_docx, 'pdf': write_pdf}
+
+
+def write(path: str, fmt: str, count: int):
+    """
+    Write a synthetic corpus.
+
+    Args:
+        path (str): Destination file.
+        fmt (str): One of FORMATS.
+        count (int): Number of quotes.
+    """
+    WRITERS[fmt](path, count)
+
+
+def main():
+    """Parse arguments and write one corpus."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--format', choices=FORMATS, required=True, help="Corpus format")
+    parser.add_argument('--quotes', type=int, default=10_000, help="Number of quotes")
+    parser.add_argument('--out', required=True, help="Destination file")
+    args = parser.parse_args()
+    write(args.out, args.format, args.quotes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+csv_ingest benchmark.
+
+Compares CSV quote ingestion strategies on a synthetic export: the previous
+pandas ``read_csv`` + ``iterrows`` implementation, the opt-in chunked pandas
+backend, CSVIngestor.parse (list) and Ingestor.iter_parse (streaming). Each
+strategy runs in a fresh interpreter so peak RSS is measured independently.
+
+Usage:
+    python -m benchmarks.csv_ingest [--rows 1000000] [--json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STRATEGIES = {
+    'pandas-iterrows': (
+        "import pandas as pd\n"
+        "from QuoteEngine.QuoteModel import QuoteModel\n"
+        "df = pd.read_csv(PATH)\n"
+        "n = len([QuoteModel(row['body'], row['author']) for _, row in df.iterrows()])\n"
+    ),
+    'pandas-chunks': (
+        "from QuoteEngine.CSVIngestor import CSVIngestor\n"
+        "n = sum(1 for _ in CSVIngestor.iter_parse(PATH, backend='pandas'))\n"
+    ),
+    'csv-parse': (
+        "from QuoteEngine.Ingestor import Ingestor\n"
+        "n = len(Ingestor.parse(PATH))\n"
+    ),
+    'csv-iter_parse': (
+        "from QuoteEngine.Ingestor import Ingestor\n"
+        "n = sum(1 for _ in Ingestor.iter_parse(PATH))\n"
+    ),
+}
+
+RUNNER = (
+    "import resource, sys, time\n"
+    "PATH = sys.argv[1]\n"
+    "start = time.perf_counter()\n"
+    "{body}"
+    "elapsed = time.perf_counter() - start\n"
+    "print(n, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+)
+
+
+def write_corpus(path: str, rows: int):
+    """
+    Write a synthetic body,author CSV with the given number of rows.
+
+    Args:
+        path (str): Destination file.
+        rows (int): Number of quote rows.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('body,author\n')
+        for i in range(rows):
+            f.write(f'"Quote number {i}, said with feeling",Author {i % 5000}\n')
+
+
+def measure(strategy: str, path: str) -> dict:
+    """
+    Run one strategy in a subprocess.
+
+    Args:
+        strategy (str): Key of STRATEGIES.
+        path (str): CSV file to ingest.
+
+    Returns:
+        dict: Rows parsed, seconds, rows/sec and peak RSS in KiB.
+    """
+    code = RUNNER.format(body=STRATEGIES[strategy])
+    result = subprocess.run([sys.executable, '-c', code, path], cwd=ROOT,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        return {'strategy': strategy, 'error': result.stderr.strip().splitlines()[-1]}
+    rows, seconds, maxrss = result.stdout.split()
+    rows, seconds = int(rows), float(seconds)
+    return {
+        'strategy': strategy,
+        'rows': rows,
+        'seconds': seconds,
+        'rows_per_sec': rows / seconds if seconds else 0.0,
+        'maxrss_kib': int(maxrss),
+    }
+
+
+def run(rows: int) -> list:
+    """
+    Generate a corpus and measure every strategy on it.
+
+    Args:
+        rows (int): Number of rows in the synthetic CSV.
+
+    Returns:
+        list: One result dict per strategy.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'quotes.csv')
+        write_corpus(path, rows)
+        return [measure(strategy, path) for strategy in STRATEGIES]
+
+
+def main():
+    """Parse arguments, run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Rows in the synthetic CSV")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows)
+    if args.json:
+        print(json.dumps({'benchmark': 'csv_ingest', 'rows': args.rows,
+                          'results': results}, indent=2))
+        return
+
+    print(f"{'strategy':<18}{'seconds':>10}{'rows/sec':>14}{'maxrss MiB':>12}")
+    for r in results:
+        if 'error' in r:
+            print(f"{r['strategy']:<18}  failed: {r['error']}")
+            continue
+        print(f"{r['strategy']:<18}{r['seconds']:>10.2f}{r['rows_per_sec']:>14,.0f}"
+              f"{r['maxrss_kib'] / 1024:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
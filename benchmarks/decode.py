@@ -0,0 +1,145 @@
+"""
+decode benchmark.
+
+Measures latency and peak memory of turning a source photo into the 500px
+base image, comparing a full decode followed by a LANCZOS resize (how
+MemeEngine used to load images) with MemeEngine._decode_resized, which uses
+JPEG draft decoding and reducing_gap. Each case runs in a fresh interpreter and
+reports its own VmHWM, since ru_maxrss would include the RSS inherited from this
+process, which holds the generated photos.
+
+Usage:
+    python -m benchmarks.decode [--megapixels 1,4,12,24,48] [--repeat 5] [--json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from PIL import Image
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STRATEGIES = {
+    'full': (
+        "from PIL import Image\n"
+        "def decode(path):\n"
+        "    with Image.open(path) as img:\n"
+        "        img = img.convert('RGB')\n"
+        "    height = int(500 / img.width * img.height)\n"
+        "    return img.resize((500, height), Image.Resampling.LANCZOS)\n"
+    ),
+    'draft': (
+        "from MemeEngine.MemeEngine import MemeEngine\n"
+        "MemeEngine.max_pixels = 0\n"
+        "def decode(path):\n"
+        "    return MemeEngine._decode_resized(path, 500, path)\n"
+    ),
+}
+
+RUNNER = (
+    "import os, resource, sys, time\n"
+    "PATH, REPEAT = sys.argv[1], int(sys.argv[2])\n"
+    "{body}"
+    "decode(PATH)\n"
+    "start = time.perf_counter()\n"
+    "for _ in range(REPEAT):\n"
+    "    decode(PATH)\n"
+    "elapsed = (time.perf_counter() - start) / REPEAT\n"
+    "peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+    "if os.path.exists('/proc/self/status'):\n"
+    "    with open('/proc/self/status') as f:\n"
+    "        peak = next(int(line.split()[1]) for line in f if line.startswith('VmHWM'))\n"
+    "print(elapsed, peak)\n"
+)
+
+
+def write_photo(path: str, megapixels: float):
+    """
+    Write a noisy 4:3 JPEG of roughly the given size.
+
+    Args:
+        path (str): Destination file.
+        megapixels (float): Pixel count in millions.
+    """
+    height = int((megapixels * 1e6 * 3 / 4) ** 0.5)
+    width = height * 4 // 3
+    noise = Image.effect_noise((width, height), 64)
+    Image.merge('RGB', (noise, noise.transpose(Image.Transpose.FLIP_LEFT_RIGHT),
+                        noise.transpose(Image.Transpose.FLIP_TOP_BOTTOM))).save(
+        path, 'JPEG', quality=90)
+
+
+def measure(strategy: str, path: str, repeat: int) -> dict:
+    """
+    Run one strategy in a subprocess.
+
+    Args:
+        strategy (str): Key of STRATEGIES.
+        path (str): Photo to decode.
+        repeat (int): Timed decodes after one warm-up.
+
+    Returns:
+        dict: Mean seconds per decode and peak RSS in KiB.
+    """
+    code = RUNNER.format(body=STRATEGIES[strategy])
+    result = subprocess.run([sys.executable, '-c', code, path, str(repeat)], cwd=ROOT,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        return {'strategy': strategy, 'error': result.stderr.strip().splitlines()[-1]}
+    seconds, maxrss = result.stdout.split()
+    return {'strategy': strategy, 'seconds': float(seconds), 'maxrss_kib': int(maxrss)}
+
+
+def run(sizes: list, repeat: int) -> list:
+    """
+    Generate a photo per size and measure every strategy on it.
+
+    Args:
+        sizes (list): Photo sizes in megapixels.
+        repeat (int): Timed decodes per measurement.
+
+    Returns:
+        list: One result dict per (size, strategy).
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for megapixels in sizes:
+            path = os.path.join(tmpdir, f'{megapixels}mp.jpg')
+            write_photo(path, megapixels)
+            for strategy in STRATEGIES:
+                results.append({'megapixels': megapixels,
+                                **measure(strategy, path, repeat)})
+    return results
+
+
+def main():
+    """Parse arguments, run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--megapixels', default='1,4,12,24,48',
+                        help="Comma-separated photo sizes in megapixels")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed decodes per case")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    sizes = [float(size) for size in args.megapixels.split(',')]
+    results = run(sizes, args.repeat)
+    if args.json:
+        print(json.dumps({'benchmark': 'decode', 'repeat': args.repeat,
+                          'results': results}, indent=2))
+        return
+
+    print(f"{'MP':>6}  {'strategy':<8}{'ms':>10}{'maxrss MiB':>12}")
+    for r in results:
+        if 'error' in r:
+            print(f"{r['megapixels']:>6g}  {r['strategy']:<8}  failed: {r['error']}")
+            continue
+        print(f"{r['megapixels']:>6g}  {r['strategy']:<8}{r['seconds'] * 1000:>10.1f}"
+              f"{r['maxrss_kib'] / 1024:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
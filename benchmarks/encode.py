@@ -0,0 +1,114 @@
+"""
+encode benchmark.
+
+Renders memes from the sample photos and measures, for every output preset
+this Pillow build supports, the time spent encoding and the bytes a client
+would download.
+
+Usage:
+    python -m benchmarks.encode [--images ./_data/photos/dog] [--repeat 5] [--json]
+"""
+
+import argparse
+import io
+import json
+import os
+import tempfile
+import time
+
+from MemeEngine.MemeEngine import MemeEngine
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def base_images(directory: str, width: int = 500) -> list:
+    """
+    Decode every photo in directory and draw a quote on it.
+
+    Args:
+        directory (str): Directory of source photos.
+        width (int, optional): Meme width.
+
+    Returns:
+        list: Ready-to-encode RGB images.
+    """
+    engine = MemeEngine(tempfile.gettempdir())
+    images = []
+    for name in sorted(os.listdir(directory)):
+        img = engine.load_base_image(os.path.join(directory, name), width).copy()
+        engine._draw_quote(img, "Bark less, wag more, and chase whatever makes you happy",
+                           "Benchmark")
+        images.append(img)
+    return images
+
+
+def measure(preset: str, images: list, repeat: int) -> dict:
+    """
+    Encode every image with a preset.
+
+    Args:
+        preset (str): A key of MemeEngine.PRESETS.
+        images (list): Images to encode.
+        repeat (int): Passes over the images.
+
+    Returns:
+        dict: Mean milliseconds and bytes per meme, and bytes relative to 'jpeg'.
+    """
+    fmt, _, options = MemeEngine.PRESETS[preset]
+    sizes = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for img in images:
+            buffer = io.BytesIO()
+            img.save(buffer, format=fmt, **options)
+            sizes.append(buffer.tell())
+    elapsed = time.perf_counter() - start
+    return {
+        'preset': preset,
+        'ms_per_image': elapsed * 1000 / len(sizes),
+        'bytes_per_image': sum(sizes) / len(sizes),
+    }
+
+
+def run(directory: str, repeat: int) -> list:
+    """
+    Measure every supported preset on the photos in directory.
+
+    Args:
+        directory (str): Directory of source photos.
+        repeat (int): Passes over the images per preset.
+
+    Returns:
+        list: One result dict per preset.
+    """
+    images = base_images(directory)
+    results = [measure(preset, images, repeat) for preset in MemeEngine.supported_presets()]
+    baseline = next((r['bytes_per_image'] for r in results if r['preset'] == 'jpeg'), None)
+    for r in results:
+        r['bytes_vs_jpeg'] = r['bytes_per_image'] / baseline if baseline else None
+    return results
+
+
+def main():
+    """Parse arguments, run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--images', default=os.path.join(ROOT, '_data', 'photos', 'dog'),
+                        help="Directory of source photos")
+    parser.add_argument('--repeat', type=int, default=5, help="Passes over the photos")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.images, args.repeat)
+    if args.json:
+        print(json.dumps({'benchmark': 'encode', 'repeat': args.repeat,
+                          'results': results}, indent=2))
+        return
+
+    print(f"{'preset':<18}{'ms/image':>10}{'bytes/image':>13}{'vs jpeg':>9}")
+    for r in results:
+        print(f"{r['preset']:<18}{r['ms_per_image']:>10.1f}{r['bytes_per_image']:>13,.0f}"
+              f"{r['bytes_vs_jpeg']:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
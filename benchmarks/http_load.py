@@ -0,0 +1,227 @@
+"""
+http_load benchmark.
+
+Compares how many slow custom-meme requests one server process handles at
+once. By default every request POSTs to /create.jpg with an image URL on a
+local stub server that trickles the image over --delay seconds, so throughput
+is bound by how many fetches a process can wait on concurrently rather than by
+rendering. --endpoints also load-tests the random meme:
+    create.jpg  POST /create.jpg with a stub image URL
+    meme.jpg    GET /meme.jpg
+
+Any response other than 2xx marks that server and endpoint as failed (and the
+run exits 1), so error pages are never reported as throughput.
+
+Servers compared, each a single process started from the repository root:
+    wsgi-sync      app.py on a non-threaded WSGI server (like a sync worker)
+    wsgi-threaded  app.py on the threaded Flask development server
+    asgi           asgi_app.py under uvicorn
+
+Usage:
+    python -m benchmarks.http_load [--requests 200] [--concurrency 50]
+                                   [--delay 1.0] [--servers asgi,wsgi-sync]
+                                   [--endpoints create.jpg,meme.jpg] [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks import stub_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = {
+    'wsgi-sync': [sys.executable, '-c',
+                  "import sys, app; app.app.run(port=int(sys.argv[1]), threaded=False)"],
+    'wsgi-threaded': [sys.executable, '-c',
+                      "import sys, app; app.app.run(port=int(sys.argv[1]), threaded=True)"],
+    'asgi': [sys.executable, '-m', 'uvicorn', 'asgi_app:app', '--port'],
+}
+
+ENDPOINTS = {
+    'create.jpg': ('POST', '/create.jpg'),
+    'meme.jpg': ('GET', '/meme.jpg'),
+}
+
+
+def free_port() -> int:
+    """Return a TCP port that is currently free on 127.0.0.1."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(name: str, port: int, env: dict) -> subprocess.Popen:
+    """
+    Start a server and wait until it accepts connections.
+
+    Args:
+        name (str): Key of SERVERS.
+        port (int): Port to listen on.
+        env (dict): Environment for the server process.
+
+    Returns:
+        subprocess.Popen: The running server.
+
+    Raises:
+        RuntimeError: If the server does not come up within 60 seconds.
+    """
+    process = subprocess.Popen(SERVERS[name] + [str(port)], cwd=ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{name} exited with status {process.returncode}")
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{name} did not start listening on port {port}")
+
+
+async def load(url: str, method: str, image_url: str, requests: int,
+               concurrency: int) -> dict:
+    """
+    Send requests requests with at most concurrency in flight.
+
+    Args:
+        url (str): The endpoint URL.
+        method (str): 'GET', or 'POST' to submit a meme form.
+        image_url (str): Image URL submitted in each form.
+        requests (int): Total requests.
+        concurrency (int): Concurrent clients.
+
+    Returns:
+        dict: Wall time, requests/sec, latency percentiles and status counts.
+    """
+    latencies = []
+    statuses = {}
+    remaining = iter(range(requests))
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=120) as client:
+        async def worker():
+            for i in remaining:
+                form = {'image_url': f'{image_url}&n={i}', 'body': f'Load test {i}',
+                        'author': 'Benchmark'}
+                start = time.perf_counter()
+                try:
+                    if method == 'POST':
+                        response = await client.post(url, data=form)
+                    else:
+                        response = await client.get(url)
+                    status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies.append(time.perf_counter() - start)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'seconds': elapsed,
+        'requests_per_sec': requests / elapsed if elapsed else 0.0,
+        'p50_seconds': latencies[len(latencies) // 2],
+        'p95_seconds': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        'statuses': statuses,
+    }
+
+
+def run(servers: list, requests: int, concurrency: int, delay: float,
+        endpoints: list = ('create.jpg',)) -> list:
+    """
+    Run the load test against each server in turn.
+
+    Args:
+        servers (list): Keys of SERVERS.
+        requests (int): Requests per server and endpoint.
+        concurrency (int): Concurrent clients.
+        delay (float): Seconds the stub takes to send each image.
+        endpoints (list, optional): Keys of ENDPOINTS.
+
+    Returns:
+        list: One result dict per (server, endpoint); those with an 'error' key
+        failed to start or got responses other than 2xx.
+    """
+    stub, stub_url = stub_server.start()
+    # A queue as deep as the load keeps 503s out of the comparison.
+    env = dict(os.environ, MEME_POOL_SIZE='0', MEME_FETCH_CACHE_BYTES='0',
+               MEME_RENDER_QUEUE=str(concurrency), PYTHONPATH=ROOT)
+    results = []
+    try:
+        for name in servers:
+            port = free_port()
+            try:
+                process = start_server(name, port, env)
+            except RuntimeError as e:
+                results.append({'server': name, 'error': str(e)})
+                continue
+            try:
+                for endpoint in endpoints:
+                    method, path = ENDPOINTS[endpoint]
+                    result = asyncio.run(load(f'http://127.0.0.1:{port}{path}', method,
+                                              f'{stub_url}/image.jpg?delay={delay}',
+                                              requests, concurrency))
+                    failed = sum(count for status, count in result['statuses'].items()
+                                 if not status.startswith('2'))
+                    if failed:
+                        result['error'] = f"{failed} of {requests} responses were not 2xx"
+                    results.append({'server': name, 'endpoint': endpoint, **result})
+            finally:
+                process.terminate()
+                process.wait()
+    finally:
+        stub.shutdown()
+    return results
+
+
+def main():
+    """Parse arguments, run the benchmark, print the results and exit 1 on any failure."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--requests', type=int, default=200,
+                        help="Requests per server and endpoint")
+    parser.add_argument('--concurrency', type=int, default=50, help="Concurrent clients")
+    parser.add_argument('--delay', type=float, default=1.0,
+                        help="Seconds the stub server takes to send each image")
+    parser.add_argument('--servers', default=','.join(SERVERS),
+                        help="Comma-separated servers to test")
+    parser.add_argument('--endpoints', default='create.jpg',
+                        help="Comma-separated endpoints to test: " + ', '.join(ENDPOINTS))
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.servers.split(','), args.requests, args.concurrency, args.delay,
+                  args.endpoints.split(','))
+    if args.json:
+        print(json.dumps({'benchmark': 'http_load', 'requests': args.requests,
+                          'concurrency': args.concurrency, 'delay': args.delay,
+                          'results': results}, indent=2))
+    else:
+        print(f"{'server':<15}{'endpoint':<12}{'seconds':>9}{'req/sec':>9}{'p50':>8}"
+              f"{'p95':>8}  statuses")
+        for r in results:
+            if 'seconds' in r:
+                print(f"{r['server']:<15}{r['endpoint']:<12}{r['seconds']:>9.2f}"
+                      f"{r['requests_per_sec']:>9.1f}{r['p50_seconds']:>8.2f}"
+                      f"{r['p95_seconds']:>8.2f}  {r['statuses']}")
+            if 'error' in r:
+                print(f"{r['server']:<15}{r.get('endpoint', ''):<12}  failed: {r['error']}")
+    if any('error' in r for r in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
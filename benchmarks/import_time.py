@@ -0,0 +1,122 @@
+"""
+import_time benchmark.
+
+Measures cold-start import cost of meme.py and app.py with ``python -X importtime``,
+comparing lazy ingestor registration (the current behaviour) against eagerly
+importing every QuoteEngine backend and pandas, as Ingestor.py used to when
+CSVIngestor imported pandas at module level.
+
+Usage:
+    python -m benchmarks.import_time [--repeat 5] [--json]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# CSVIngestor now imports pandas only for its opt-in backend, so import it here
+# to reproduce the old start-up cost.
+EAGER_PREFIX = (
+    "import QuoteEngine.TextIngestor, QuoteEngine.CSVIngestor, "
+    "QuoteEngine.DocxIngestor, QuoteEngine.PDFIngestor, pandas; "
+)
+
+TARGETS = {
+    'meme.py (import)': "import meme",
+    'meme.py (load quotes)': "import meme; meme.load_quotes()",
+    'app.py (import + setup)': "import app",
+}
+
+HEAVY_MODULES = ('pandas', 'numpy', 'docx', 'lxml')
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)')
+
+
+def measure(statement: str) -> dict:
+    """
+    Run statement in a fresh interpreter with -X importtime.
+
+    Args:
+        statement (str): Python code to execute.
+
+    Returns:
+        dict: Total import time (ms), peak RSS (KiB) and heavy modules loaded.
+    """
+    probe = (
+        "; import resource, sys; "
+        "sys.stderr.write('MAXRSS %d\\n' % resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement + probe],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{statement!r} failed:\n{result.stderr[-2000:]}")
+
+    self_us = 0
+    loaded = set()
+    maxrss = 0
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us += int(match.group(1))
+            loaded.add(match.group(4).split('.')[0])
+        elif line.startswith('MAXRSS '):
+            maxrss = int(line.split()[1])
+    return {
+        'import_ms': self_us / 1000,
+        'maxrss_kib': maxrss,
+        'heavy_modules': sorted(loaded.intersection(HEAVY_MODULES)),
+    }
+
+
+def run(repeat: int = 5) -> list:
+    """
+    Measure every target in lazy and eager mode.
+
+    Args:
+        repeat (int, optional): Runs per measurement; the median is reported.
+
+    Returns:
+        list: One result dict per (target, mode).
+    """
+    results = []
+    for name, statement in TARGETS.items():
+        for mode, prefix in (('lazy', ''), ('eager', EAGER_PREFIX)):
+            runs = [measure(prefix + statement) for _ in range(repeat)]
+            results.append({
+                'target': name,
+                'mode': mode,
+                'import_ms': statistics.median(r['import_ms'] for r in runs),
+                'maxrss_kib': statistics.median(r['maxrss_kib'] for r in runs),
+                'heavy_modules': runs[-1]['heavy_modules'],
+            })
+    return results
+
+
+def main():
+    """Parse arguments, run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per measurement")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    if args.json:
+        print(json.dumps({'benchmark': 'import_time', 'results': results}, indent=2))
+        return
+
+    print(f"{'target':<26}{'mode':<8}{'import ms':>11}{'maxrss MiB':>12}  heavy modules")
+    for r in results:
+        print(f"{r['target']:<26}{r['mode']:<8}{r['import_ms']:>11.1f}"
+              f"{r['maxrss_kib'] / 1024:>12.1f}  {', '.join(r['heavy_modules']) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
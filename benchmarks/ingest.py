@@ -0,0 +1,114 @@
+"""
+ingest benchmark.
+
+Measures every Ingestor backend on synthetic corpora of increasing size:
+quotes per second and peak memory of streaming a file through
+Ingestor.iter_parse. Each case runs in a fresh interpreter that reports its
+own VmHWM.
+
+DOCX and PDF corpora are slow to generate and parse; pass larger sizes
+explicitly, e.g. --sizes 10000,100000,1000000,10000000 --formats txt,csv.
+
+Usage:
+    python -m benchmarks.ingest [--sizes 10000,100000] [--formats txt,csv,docx,pdf] [--json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks import corpora
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RUNNER = (
+    "import os, resource, sys, time\n"
+    "from QuoteEngine.Ingestor import Ingestor\n"
+    "start = time.perf_counter()\n"
+    "n = sum(1 for _ in Ingestor.iter_parse(sys.argv[1]))\n"
+    "elapsed = time.perf_counter() - start\n"
+    "peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+    "if os.path.exists('/proc/self/status'):\n"
+    "    with open('/proc/self/status') as f:\n"
+    "        peak = next(int(line.split()[1]) for line in f if line.startswith('VmHWM'))\n"
+    "print(n, elapsed, peak)\n"
+)
+
+
+def measure(path: str) -> dict:
+    """
+    Stream one corpus through Ingestor.iter_parse in a subprocess.
+
+    Args:
+        path (str): The corpus file.
+
+    Returns:
+        dict: Quotes parsed, seconds, quotes/sec and peak RSS in KiB.
+    """
+    result = subprocess.run([sys.executable, '-c', RUNNER, path], cwd=ROOT,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        return {'error': result.stderr.strip().splitlines()[-1]}
+    quotes, seconds, peak = result.stdout.split()
+    quotes, seconds = int(quotes), float(seconds)
+    return {
+        'quotes': quotes,
+        'seconds': seconds,
+        'quotes_per_sec': quotes / seconds if seconds else 0.0,
+        'maxrss_kib': int(peak),
+        'file_bytes': os.path.getsize(path),
+    }
+
+
+def run(sizes: list, formats: list) -> list:
+    """
+    Generate each corpus and measure it.
+
+    Args:
+        sizes (list): Corpus sizes in quotes.
+        formats (list): Corpus formats, see corpora.FORMATS.
+
+    Returns:
+        list: One result dict per (format, size).
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for fmt in formats:
+            for size in sizes:
+                path = os.path.join(tmpdir, f'quotes_{size}.{fmt}')
+                corpora.write(path, fmt, size)
+                results.append({'format': fmt, 'size': size, **measure(path)})
+                os.remove(path)
+    return results
+
+
+def main():
+    """Parse arguments, run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='10000,100000',
+                        help="Comma-separated corpus sizes in quotes")
+    parser.add_argument('--formats', default=','.join(corpora.FORMATS),
+                        help="Comma-separated corpus formats")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    results = run(sizes, args.formats.split(','))
+    if args.json:
+        print(json.dumps({'benchmark': 'ingest', 'results': results}, indent=2))
+        return
+
+    print(f"{'format':<8}{'quotes':>12}{'seconds':>10}{'quotes/sec':>14}{'maxrss MiB':>12}")
+    for r in results:
+        if 'error' in r:
+            print(f"{r['format']:<8}{r['size']:>12,}  failed: {r['error']}")
+            continue
+        print(f"{r['format']:<8}{r['quotes']:>12,}{r['seconds']:>10.2f}"
+              f"{r['quotes_per_sec']:>14,.0f}{r['maxrss_kib'] / 1024:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
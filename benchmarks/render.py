@@ -0,0 +1,106 @@
+"""
+render benchmark.
+
+Times MemeEngine.make_meme across source photo sizes and quote lengths, with
+the decoded base-image and text-tile caches disabled (every call decodes its
+photo and rasterizes its quote) and enabled (repeat calls reuse both).
+
+Usage:
+    python -m benchmarks.render [--megapixels 0.25,1,4,12] [--repeat 10] [--json]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.decode import write_photo
+from MemeEngine.MemeEngine import MemeEngine
+
+TEXTS = {
+    'short': "Who's a good dog?",
+    'medium': "Be the person your dog thinks you are, and take every walk like it "
+              "is the first walk you have ever been on",
+    'long': " ".join(["Every dog must have his day, and this one starts with a nap in the "
+                      "sun, continues with a long walk through the park,"] * 4),
+}
+
+
+def measure(engine: MemeEngine, photo: str, text: str, repeat: int, cached: bool) -> float:
+    """
+    Return mean seconds per make_meme call.
+
+    Args:
+        engine (MemeEngine): Engine writing to a scratch directory.
+        photo (str): Source photo path.
+        text (str): Quote body.
+        repeat (int): Timed calls after one warm-up.
+        cached (bool): Keep the base-image and text-tile caches enabled.
+
+    Returns:
+        float: Mean seconds per call.
+    """
+    for cache in (MemeEngine.base_image_cache, MemeEngine.text_tile_cache):
+        cache.clear()
+        cache.resize(max_bytes=64 * 1024 * 1024 if cached else 0)
+    engine.make_meme(photo, text, 'Benchmark')
+    start = time.perf_counter()
+    for _ in range(repeat):
+        engine.make_meme(photo, text, 'Benchmark')
+    return (time.perf_counter() - start) / repeat
+
+
+def run(sizes: list, repeat: int) -> list:
+    """
+    Measure every (photo size, text length, cache mode) combination.
+
+    Args:
+        sizes (list): Photo sizes in megapixels.
+        repeat (int): Timed calls per combination.
+
+    Returns:
+        list: One result dict per combination.
+    """
+    results = []
+    budgets = [(cache, cache.max_bytes)
+               for cache in (MemeEngine.base_image_cache, MemeEngine.text_tile_cache)]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = MemeEngine(os.path.join(tmpdir, 'out'), max_files=100)
+        for megapixels in sizes:
+            photo = os.path.join(tmpdir, f'{megapixels}mp.jpg')
+            write_photo(photo, megapixels)
+            for length, text in TEXTS.items():
+                for cached in (False, True):
+                    seconds = measure(engine, photo, text, repeat, cached)
+                    results.append({'megapixels': megapixels, 'text': length,
+                                    'cached': cached, 'ms_per_meme': seconds * 1000})
+    for cache, budget in budgets:
+        cache.resize(max_bytes=budget)
+    return results
+
+
+def main():
+    """Parse arguments, run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--megapixels', default='0.25,1,4,12',
+                        help="Comma-separated photo sizes in megapixels")
+    parser.add_argument('--repeat', type=int, default=10, help="Timed calls per case")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    sizes = [float(size) for size in args.megapixels.split(',')]
+    results = run(sizes, args.repeat)
+    if args.json:
+        print(json.dumps({'benchmark': 'render', 'repeat': args.repeat,
+                          'results': results}, indent=2))
+        return
+
+    print(f"{'MP':>6}  {'text':<8}{'cache':<7}{'ms/meme':>10}")
+    for r in results:
+        print(f"{r['megapixels']:>6g}  {r['text']:<8}{'on' if r['cached'] else 'off':<7}"
+              f"{r['ms_per_meme']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+stub_server benchmark helper.
+
+A local HTTP server that serves a generated JPEG slowly, standing in for a
+remote image host during load tests. ``GET /image.jpg?delay=2`` spreads the
+body over about two seconds, like a slow upload link.
+
+Usage:
+    python -m benchmarks.stub_server [--port 8900] [--width 1200] [--height 800]
+"""
+
+import argparse
+import io
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from PIL import Image
+
+
+def make_jpeg(width: int, height: int) -> bytes:
+    """
+    Encode a gradient test photo.
+
+    Args:
+        width (int): Image width in pixels.
+        height (int): Image height in pixels.
+
+    Returns:
+        bytes: The JPEG data.
+    """
+    gradient = Image.linear_gradient('L').resize((width, height))
+    img = Image.merge('RGB', (gradient, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT),
+                              gradient.transpose(Image.Transpose.ROTATE_180)))
+    buffer = io.BytesIO()
+    img.save(buffer, 'JPEG', quality=90)
+    return buffer.getvalue()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serve the server's JPEG, throttled by the delay query parameter."""
+
+    chunks = 10
+
+    def do_GET(self):
+        """Send the image in equal chunks spaced over the requested delay."""
+        query = parse_qs(urlparse(self.path).query)
+        delay = float(query.get('delay', ['0'])[0])
+        data = self.server.image
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        step = -(-len(data) // self.chunks)
+        for start in range(0, len(data), step):
+            if delay:
+                time.sleep(delay / self.chunks)
+            self.wfile.write(data[start:start + step])
+
+    def log_message(self, format, *args):
+        """Keep load tests quiet."""
+
+
+def start(port: int = 0, width: int = 1200, height: int = 800) -> tuple:
+    """
+    Start the stub server in a daemon thread.
+
+    Args:
+        port (int, optional): Port to bind on 127.0.0.1; 0 picks a free one.
+        width (int, optional): Width of the served image.
+        height (int, optional): Height of the served image.
+
+    Returns:
+        tuple: The server (call shutdown() to stop it) and its base URL.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+    server.daemon_threads = True
+    server.image = make_jpeg(width, height)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def main():
+    """Parse arguments and serve until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--port', type=int, default=8900, help="Port to listen on")
+    parser.add_argument('--width', type=int, default=1200, help="Image width")
+    parser.add_argument('--height', type=int, default=800, help="Image height")
+    args = parser.parse_args()
+
+    server, url = start(args.port, args.width, args.height)
+    print(f"Serving {len(server.image)} byte JPEG at {url}/image.jpg?delay=<seconds>")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+suite benchmark.
+
+Runs the ingest, render, decode, encode and http_load benchmarks and writes
+their results, together with the interpreter, platform, time and git commit
+they were measured on, to one JSON file that benchmarks.compare can diff
+against an earlier run.
+
+Usage:
+    python -m benchmarks.suite --out results.json [--scale quick|full]
+                               [--only ingest,render]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+from benchmarks import decode, encode, http_load, ingest, render
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCALES = {
+    'quick': {
+        'ingest': lambda: ingest.run([10_000], ['txt', 'csv', 'docx', 'pdf']),
+        'render': lambda: render.run([0.25, 4], 5),
+        'decode': lambda: decode.run([4, 24], 3),
+        'encode': lambda: encode.run(os.path.join(ROOT, '_data', 'photos', 'dog'), 2),
+        'http_load': lambda: http_load.run(['wsgi-threaded', 'asgi'], 50, 10, 0.2,
+                                           ['create.jpg', 'meme.jpg']),
+    },
+    'full': {
+        'ingest': lambda: (ingest.run([10_000, 100_000, 1_000_000, 10_000_000], ['txt', 'csv'])
+                           + ingest.run([10_000, 100_000, 1_000_000], ['docx', 'pdf'])),
+        'render': lambda: render.run([0.25, 1, 4, 12], 10),
+        'decode': lambda: decode.run([1, 4, 12, 24, 48], 5),
+        'encode': lambda: encode.run(os.path.join(ROOT, '_data', 'photos', 'dog'), 5),
+        'http_load': lambda: http_load.run(list(http_load.SERVERS), 200, 50, 1.0,
+                                           list(http_load.ENDPOINTS)),
+    },
+}
+
+
+def git_commit() -> str:
+    """Return the checked-out commit, or None outside a git checkout."""
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def run(scale: str, only: list = None) -> dict:
+    """
+    Run the benchmarks at a scale.
+
+    Args:
+        scale (str): Key of SCALES.
+        only (list, optional): Benchmarks to run. Defaults to all of them.
+
+    Returns:
+        dict: Run metadata and each benchmark's results.
+    """
+    benchmarks = {}
+    for name, benchmark in SCALES[scale].items():
+        if only and name not in only:
+            continue
+        print(f"Running {name}...", file=sys.stderr)
+        benchmarks[name] = benchmark()
+    return {
+        'scale': scale,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'commit': git_commit(),
+        'benchmarks': benchmarks,
+    }
+
+
+def main():
+    """Parse arguments, run the suite, write the results and exit 1 on any failure."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--out', required=True, help="Destination JSON file")
+    parser.add_argument('--scale', choices=SCALES, default='quick',
+                        help="Corpus sizes, photo sizes and request counts to use")
+    parser.add_argument('--only', help="Comma-separated benchmarks to run: "
+                        + ', '.join(SCALES['quick']))
+    args = parser.parse_args()
+
+    only = args.only.split(',') if args.only else None
+    results = run(args.scale, only)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {args.out}", file=sys.stderr)
+    failures = [(name, r['error']) for name, rs in results['benchmarks'].items()
+                for r in rs if 'error' in r]
+    for name, error in failures:
+        print(f"{name} failed: {error}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
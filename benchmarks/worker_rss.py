@@ -0,0 +1,151 @@
+"""
+worker_rss benchmark.
+
+Measures per-worker memory for a large synthetic quote corpus held three ways:
+a private list of QuoteModel (how app.py used to keep quotes), a private
+QuoteStore, and a SharedCorpus file memory-mapped by every worker. All workers
+stay alive while /proc/self/smaps_rollup is read, so PSS reflects sharing.
+
+Linux only. Usage:
+    python -m benchmarks.worker_rss [--quotes 1000000] [--workers 4] [--json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOADERS = {
+    'list': (
+        "from QuoteEngine.Ingestor import Ingestor\n"
+        "quotes = Ingestor.parse(CSV)\n"
+        "touch = [(q.body, q.author) for q in quotes[::97]]\n"
+    ),
+    'store': (
+        "from QuoteEngine.Ingestor import Ingestor\n"
+        "from QuoteEngine.QuoteStore import QuoteStore\n"
+        "quotes = QuoteStore(Ingestor.iter_parse(CSV))\n"
+        "touch = [quotes.body(i) for i in range(0, len(quotes), 97)]\n"
+    ),
+    'shared': (
+        "from QuoteEngine.SharedCorpus import SharedCorpus\n"
+        "corpus = SharedCorpus.attach(SHARED)\n"
+        "quotes = corpus.quotes\n"
+        "touch = [quotes.body(i) for i in range(0, len(quotes), 97)]\n"
+    ),
+}
+
+WORKER = (
+    "import json, sys\n"
+    "CSV, SHARED = sys.argv[1], sys.argv[2]\n"
+    "{loader}"
+    "print('ready', flush=True)\n"
+    "sys.stdin.readline()\n"
+    "stats = {{}}\n"
+    "with open('/proc/self/smaps_rollup') as f:\n"
+    "    for line in f:\n"
+    "        parts = line.split()\n"
+    "        if len(parts) == 3 and parts[2] == 'kB':\n"
+    "            stats[parts[0].rstrip(':')] = int(parts[1])\n"
+    "print(json.dumps(stats), flush=True)\n"
+)
+
+
+def build_inputs(directory: str, count: int) -> tuple:
+    """
+    Write a synthetic CSV corpus and the matching shared corpus file.
+
+    Args:
+        directory (str): Where to write the files.
+        count (int): Number of quotes.
+
+    Returns:
+        tuple: (csv path, shared corpus path).
+    """
+    sys.path.insert(0, ROOT)
+    from QuoteEngine.Ingestor import Ingestor
+    from QuoteEngine.QuoteStore import QuoteStore
+    from QuoteEngine.SharedCorpus import SharedCorpus
+
+    csv_path = os.path.join(directory, 'quotes.csv')
+    with open(csv_path, 'w', encoding='utf-8') as f:
+        f.write('body,author\n')
+        for i in range(count):
+            f.write(f'Quote number {i} is about dogs and treats,Author {i % 5000}\n')
+
+    shared_path = os.path.join(directory, 'corpus.bin')
+    SharedCorpus.write(shared_path, QuoteStore(Ingestor.iter_parse(csv_path)), [])
+    return csv_path, shared_path
+
+
+def measure(mode: str, workers: int, csv_path: str, shared_path: str) -> dict:
+    """
+    Start workers that load the corpus in one mode and report their memory.
+
+    Args:
+        mode (str): Key of LOADERS.
+        workers (int): Number of concurrent worker processes.
+        csv_path (str): Synthetic CSV corpus.
+        shared_path (str): Shared corpus file.
+
+    Returns:
+        dict: Mean RSS, PSS and private memory per worker, in MiB.
+    """
+    code = WORKER.format(loader=LOADERS[mode])
+    procs = [
+        subprocess.Popen([sys.executable, '-c', code, csv_path, shared_path], cwd=ROOT,
+                         stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for _ in range(workers)
+    ]
+    for proc in procs:
+        if proc.stdout.readline().strip() != 'ready':
+            raise RuntimeError(f"{mode} worker failed to start")
+    stats = []
+    for proc in procs:
+        proc.stdin.write('\n')
+        proc.stdin.flush()
+        stats.append(json.loads(proc.stdout.readline()))
+    for proc in procs:
+        proc.wait()
+
+    def mean_mib(*keys):
+        return sum(sum(s.get(k, 0) for k in keys) for s in stats) / len(stats) / 1024
+
+    return {
+        'mode': mode,
+        'workers': workers,
+        'rss_mib': mean_mib('Rss'),
+        'pss_mib': mean_mib('Pss'),
+        'private_mib': mean_mib('Private_Clean', 'Private_Dirty'),
+    }
+
+
+def main():
+    """Parse arguments, run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--quotes', type=int, default=1_000_000, help="Quotes in the corpus")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent workers")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        csv_path, shared_path = build_inputs(tmpdir, args.quotes)
+        results = [measure(mode, args.workers, csv_path, shared_path) for mode in LOADERS]
+
+    if args.json:
+        print(json.dumps({'benchmark': 'worker_rss', 'quotes': args.quotes,
+                          'results': results}, indent=2))
+        return
+
+    print(f"{'mode':<8}{'workers':>8}{'RSS MiB':>10}{'PSS MiB':>10}{'private MiB':>13}")
+    for r in results:
+        print(f"{r['mode']:<8}{r['workers']:>8}{r['rss_mib']:>10.1f}"
+              f"{r['pss_mib']:>10.1f}{r['private_mib']:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,81 @@
 """
 meme.py.
 
-This script handles the generation of memes using random or user-provided images and quotes.
+This script handles the generation of memes using random or user-provided images and quotes,
+either one at a time or in batches rendered across a process pool.
 """
 
 import os
+import csv
+import json
+import time
 import random
+import logging
 import argparse
 from QuoteEngine.QuoteModel import QuoteModel
-from QuoteEngine.Ingestor import Ingestor
+from QuoteEngine.CorpusSnapshot import CorpusSnapshot
+from QuoteEngine.QuoteStore import QuoteStore
+from MemeEngine.ImageCatalog import ImageCatalog
 from MemeEngine.MemeEngine import MemeEngine
 
+logger = logging.getLogger(__name__)
+
+TMP_MAX_FILES = int(os.environ.get('MEME_TMP_MAX_FILES', 100))
+CORPUS_SNAPSHOT = os.environ.get('MEME_CORPUS_SNAPSHOT', './.cache/quote_corpus.json')
+PHOTO_CATALOG = os.environ.get('MEME_PHOTO_CATALOG', './.cache/photo_catalog.json')
+
+IMAGES_PATH = "./_data/photos/dog/"
+QUOTE_FILES = [
+    './_data/DogQuotes/DogQuotesTXT.txt',
+    './_data/DogQuotes/DogQuotesDOCX.docx',
+    './_data/DogQuotes/DogQuotesPDF.pdf',
+    './_data/DogQuotes/DogQuotesCSV.csv'
+]
+
+
+def load_images(images=IMAGES_PATH):
+    """
+    List every valid image below a directory, using the photo catalog.
+
+    Only directories that changed since the last run are listed again, and
+    files that cannot be decoded are left out.
+
+    Args:
+        images (str, optional): Directory to search.
+
+    Returns:
+        list: Paths of the images found.
+    """
+    catalog = ImageCatalog(PHOTO_CATALOG, [images])
+    catalog.scan()
+    imgs = catalog.images()
+
+    if not imgs:
+        raise Exception(f"No images found in {images}")
+    return imgs
+
+
+def load_quotes(quote_files=QUOTE_FILES):
+    """
+    Load every quote file from the corpus snapshot, reparsing changed files.
+
+    Files that fail to parse are logged and skipped.
+
+    Args:
+        quote_files (list, optional): Paths of the quote files.
+
+    Returns:
+        QuoteStore: The quotes from all files.
+    """
+    report = CorpusSnapshot(CORPUS_SNAPSHOT).load(quote_files)
+    for f, error in report.errors.items():
+        logger.warning("Error parsing %s: %s", f, error)
+    quotes = QuoteStore(report.quotes)
+
+    if not quotes:
+        raise Exception("No quotes found.")
+    return quotes
+
 
 def generate_meme(path=None, body=None, author=None):
     """
@@ -28,47 +93,146 @@ def generate_meme(path=None, body=None, author=None):
     quote = None
 
     if path is None:
-        images = "./_data/photos/dog/"
-        imgs = []
-        for root, dirs, files in os.walk(images):
-            imgs.extend([os.path.join(root, name) for name in files])
-
-        if not imgs:
-            raise Exception(f"No images found in {images}")
-        img = random.choice(imgs)
+        img = random.choice(load_images())
     else:
         img = path
 
     if body is None:
-        quote_files = [
-            './_data/DogQuotes/DogQuotesTXT.txt',
-            './_data/DogQuotes/DogQuotesDOCX.docx',
-            './_data/DogQuotes/DogQuotesPDF.pdf',
-            './_data/DogQuotes/DogQuotesCSV.csv'
-        ]
-        quotes = []
-        for f in quote_files:
-            quotes.extend(Ingestor.parse(f))
-
-        if not quotes:
-            raise Exception("No quotes found.")
-        quote = random.choice(quotes)
+        quote = load_quotes().choice()
     else:
         if author is None:
             raise Exception('Author Required if Body is Used')
         quote = QuoteModel(body, author)
 
-    meme = MemeEngine('./tmp')
+    meme = MemeEngine('./tmp', max_files=TMP_MAX_FILES)
     output_path = meme.make_meme(img, quote.body, quote.author)
     return output_path
 
 
+def read_manifest(path):
+    """
+    Read batch jobs from a CSV (with a header row) or JSON Lines file.
+
+    Each row may set 'image', 'body' and 'author'; missing values are filled
+    in at random when the batch runs. A JSON Lines row that is not valid JSON,
+    or not an object, gets an 'error' naming its line instead, so it is
+    reported as a failed item rather than aborting the batch.
+
+    Args:
+        path (str): Path to a .csv or .jsonl manifest.
+
+    Returns:
+        list: One dict per job, with 'image', 'body', 'author' and 'error'.
+    """
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.lower().endswith('.csv'):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = []
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    row = {'error': f"line {number}: invalid JSON ({e})"}
+                else:
+                    if not isinstance(row, dict):
+                        row = {'error': f"line {number}: expected a JSON object, "
+                                        f"got {type(row).__name__}"}
+                rows.append(row)
+
+    return [
+        {key: (row.get(key) or None) for key in ('image', 'body', 'author', 'error')}
+        for row in rows
+    ]
+
+
+def generate_batch(out_dir, count=None, manifest=None, jobs=None):
+    """
+    Generate many memes, loading quotes and images only once.
+
+    Rendering goes through MemeEngine.make_memes, so each photo is decoded
+    once no matter how many quotes are drawn on it.
+
+    Args:
+        out_dir (str): Directory where memes are written.
+        count (int, optional): Number of random memes to generate when no
+            manifest is given.
+        manifest (str, optional): CSV/JSONL manifest of image/body/author rows.
+        jobs (int, optional): Worker processes; defaults to the CPU count.
+
+    Returns:
+        dict: Paths generated, per-item failures, elapsed time and throughput.
+    """
+    rows = read_manifest(manifest) if manifest else [{}] * (count or 0)
+
+    valid = [row for row in rows if not row.get('error')]
+    imgs = None
+    if any(not row.get('image') for row in valid):
+        imgs = load_images()
+    quotes = None
+    if any(not row.get('body') for row in valid):
+        quotes = load_quotes()
+
+    work = []
+    failures = []
+    for index, row in enumerate(rows):
+        if row.get('error'):
+            failures.append((index, row['error']))
+            continue
+        img = row.get('image') or random.choice(imgs)
+        if row.get('body'):
+            if not row.get('author'):
+                failures.append((index, 'Author Required if Body is Used'))
+                continue
+            body, author = row['body'], row['author']
+        else:
+            quote = quotes.choice()
+            body, author = quote.body, quote.author
+        work.append((index, img, body, author))
+
+    start = time.perf_counter()
+    meme = MemeEngine(out_dir)
+    paths = []
+    results = meme.make_memes((job[1:] for job in work), workers=jobs)
+    for position, path, error in results:
+        if error:
+            failures.append((work[position][0], error))
+        else:
+            paths.append(path)
+    elapsed = time.perf_counter() - start
+    failures.sort()
+
+    return {
+        'paths': paths,
+        'failures': failures,
+        'elapsed': elapsed,
+        'per_second': len(paths) / elapsed if elapsed else 0.0,
+    }
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generate a meme from text and image")
     parser.add_argument('--path', type=str, help="Path to an image file")
     parser.add_argument('--body', type=str, help="Quote body text")
     parser.add_argument('--author', type=str, help="Author of the quote")
+    parser.add_argument('--count', type=int, help="Batch mode: number of random memes")
+    parser.add_argument('--manifest', type=str,
+                        help="Batch mode: CSV/JSONL file with image, body, author columns")
+    parser.add_argument('--out', type=str, default='./out',
+                        help="Batch mode: output directory (default ./out)")
+    parser.add_argument('--jobs', type=int, help="Batch mode: worker processes")
 
     args = parser.parse_args()
 
-    print(generate_meme(args.path, args.body, args.author))
+    if args.count or args.manifest:
+        report = generate_batch(args.out, args.count, args.manifest, args.jobs)
+        for index, error in report['failures']:
+            print(f"Item {index} failed: {error}")
+        print(
+            f"Generated {len(report['paths'])} memes in {report['elapsed']:.2f}s "
+            f"({report['per_second']:.1f}/s), {len(report['failures'])} failed"
+        )
+    else:
+        print(generate_meme(args.path, args.body, args.author))